@@ -7,9 +7,24 @@ Core engine and components for the Cyberpunk HUD Toolkit.
 # Import the main engine and scene classes.
 from .engine import Engine       # Expected Engine class handling the main loop and scene management
 from .scene import Scene         # Expected Scene class definition
+from .clock import SceneClock
+from .container import EffectContainer
+from .tween import Tween, Tweener
+from .spatial import SpatialGrid
+from .profiler import Profiler, ProfilerOverlay
+from .recorder import FrameRecorder
+from .collector import FrameCollector
+from .tasks import FrameTasks
+from .binding import Observable, Stream, Binding, flush_bindings
 
 # Import base effect class and any simple effects.
-from .effect import Effect
+from .effect import Effect, EffectPool
+
+# Shared font registry and rendered-text cache.
+from .fonts import get_font, render_text, TextCache
+
+# Helpers for pre-rendered sprites and atlases.
+from .sprites import display_format, circle_sprites
 
 # Import transitions (such as FadeTransition, GlitchTransition, etc.)
 from .transition import *        # Using * to import all defined transitions.
@@ -0,0 +1,289 @@
+"""
+core/bench.py
+
+Per-widget rendering benchmarks. Every HUD element and transition is driven
+headlessly (offscreen Engine, fixed dt) at several resolutions and element
+counts; per-frame update+draw times are written to JSON.
+
+Usage:
+    python -m core.bench --out bench.json
+    python -m core.bench --only HexGrid,RadarSweep --frames 120
+    python -m core.bench --compare bench.json   # exit code 1 on regressions
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from collections import namedtuple
+
+import pygame
+
+from core.engine import Engine
+from core.scene import Scene
+from core.effect import Effect
+from core.hud.circular import CircularProgress
+from core.hud.console import Console
+from core.hud.fireworks import Fireworks
+from core.hud.matrix import MatrixRain
+from core.hud.panel import SlidingPanel
+from core.hud.particles import ParticleEmitter
+from core.hud.radar import RadarSweep
+from core.hud.shapes import HexGrid
+from core.hud.text import TextBlock
+from core.transition import FadeTransition, GlitchTransition, SlideTransition
+
+RESOLUTIONS = [(640, 480), (1280, 720), (1920, 1080)]
+
+# long enough that timed effects never expire mid-benchmark
+_FOREVER = 1e9
+
+# name, factory(width, height, count) -> [Effect], counts, what count means
+Benchmark = namedtuple("Benchmark", "name factory counts unit")
+
+
+def _layout(count, width, height, size):
+    """
+    Spread `count` centers of `size`-pixel widgets over the screen in a grid.
+    """
+    cols = max(1, width // size)
+    return [((i % cols) * size + size // 2, (i // cols) % max(1, height // size) * size + size // 2)
+            for i in range(count)]
+
+
+def _gauges(width, height, count):
+    return [CircularProgress(x, y, radius=40, value=0.5) for x, y in _layout(count, width, height, 100)]
+
+
+def _ticking_gauges(width, height, count):
+    # each gauge moves one quantization step per second, like a 1 Hz feed
+    gauges = _gauges(width, height, count)
+    for i, gauge in enumerate(gauges):
+        gauge.value = (i % 50) / 100.0
+        gauge.speed = 1.0 / gauge.steps
+    return gauges
+
+
+def _radars(width, height, count):
+    return [RadarSweep(x, y, radius=90, seed=i) for i, (x, y) in enumerate(_layout(count, width, height, 200))]
+
+
+def _radar_contacts(width, height, count):
+    return [RadarSweep(width // 2, height // 2, radius=min(width, height) // 3, sweep_speed=3.0,
+                       blip_count=count, seed=0)]
+
+
+def _fireworks(width, height, count):
+    # launch often enough that about `count` bursts are alive at once
+    return [Fireworks(spawn_interval=2.0 / count, sparks_per_burst=100, seed=0)]
+
+
+def _matrix(width, height, count):
+    return [MatrixRain(columns=count, seed=0)]
+
+
+class _LogFeed(Effect):
+    """
+    Writes `rate` lines per frame into a Console, like a busy log producer.
+    """
+    def __init__(self, console, rate):
+        super().__init__()
+        self.console = console
+        self.rate = rate
+        self.written = 0
+
+    def update(self, dt):
+        super().update(dt)
+        start = self.written
+        self.written += self.rate
+        self.console.write_lines(["[%08d] worker-%d: request handled in %d ms" % (n, n % 7, n % 250)
+                                  for n in range(start, self.written)])
+
+
+def _console(width, height, count):
+    console = Console(0, 0, width, height, capacity=10000, font_size=16, prompt=None)
+    return [console, _LogFeed(console, count)]
+
+
+def _panels(width, height, count):
+    return [SlidingPanel(x - 80, y - 60, 160, 120, direction='left') for x, y in _layout(count, width, height, 200)]
+
+
+def _texts(width, height, count):
+    return [TextBlock("SYSTEM STATUS %d" % i, x - 60, y, font_size=18) for i, (x, y) in enumerate(_layout(count, width, height, 150))]
+
+
+def _particles(width, height, count):
+    # spawn fast enough to reach `count` live particles within the warmup
+    return [ParticleEmitter(width // 2, height // 2, max_particles=count, spawn_rate=max(1, count // 30))]
+
+
+def _hexgrid(width, height, count):
+    return [HexGrid(cell_size=count)]
+
+
+def _fade(width, height, count):
+    return [FadeTransition(duration=_FOREVER)]
+
+
+def _glitch(width, height, count):
+    return [GlitchTransition(duration=_FOREVER)]
+
+
+def _slide(width, height, count):
+    return [SlideTransition(duration=_FOREVER)]
+
+
+BENCHMARKS = [
+    Benchmark("HexGrid", _hexgrid, (60, 30, 15), "cell_size"),
+    Benchmark("ParticleEmitter", _particles, (100, 1000, 10000, 50000), "particles"),
+    Benchmark("RadarSweep", _radars, (1, 10, 50), "instances"),
+    Benchmark("RadarContacts", _radar_contacts, (100, 1000, 10000), "blips"),
+    Benchmark("CircularProgress", _gauges, (1, 20, 200), "instances"),
+    Benchmark("TickingGauges", _ticking_gauges, (20, 200), "instances"),
+    Benchmark("MatrixRain", _matrix, (40, 200, 400), "columns"),
+    Benchmark("Fireworks", _fireworks, (10, 50, 100), "bursts"),
+    Benchmark("Console", _console, (1, 100, 1000), "lines_per_frame"),
+    Benchmark("SlidingPanel", _panels, (1, 10, 50), "instances"),
+    Benchmark("TextBlock", _texts, (1, 20, 200), "instances"),
+    Benchmark("FadeTransition", _fade, (1,), "instances"),
+    Benchmark("GlitchTransition", _glitch, (1,), "instances"),
+    Benchmark("SlideTransition", _slide, (1,), "instances"),
+]
+
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_case(bench, width, height, count, frames=300, warmup=30, fps=60):
+    """
+    Time `frames` frames of Scene.update + Scene.draw for one configuration.
+
+    :return: dict with mean/p50/p99/max frame times in milliseconds
+    """
+    engine = Engine(width=width, height=height, fps=fps, offscreen=True)
+    scene = Scene(effects=bench.factory(width, height, count))
+    scene.reset(engine)
+    dt = 1.0 / fps
+
+    for _ in range(warmup):
+        scene.update(dt)
+        scene.draw(engine.screen)
+
+    times = []
+    for _ in range(frames):
+        t0 = time.perf_counter_ns()
+        scene.update(dt)
+        scene.draw(engine.screen)
+        times.append((time.perf_counter_ns() - t0) / 1e6)
+
+    times.sort()
+    mean = statistics.fmean(times)
+    return {
+        "mean_ms": mean,
+        "p50_ms": _percentile(times, 50),
+        "p99_ms": _percentile(times, 99),
+        "max_ms": times[-1],
+        "fps": 1000.0 / mean if mean else float("inf"),
+    }
+
+
+def case_key(bench, width, height, count):
+    return "%s@%dx%d/%s=%d" % (bench.name, width, height, bench.unit, count)
+
+
+def run_all(only=None, resolutions=RESOLUTIONS, frames=300, warmup=30, log=print):
+    """
+    Run every registered benchmark (or those named in `only`).
+
+    :return: JSON-serializable report
+    """
+    results = {}
+    for bench in BENCHMARKS:
+        if only and bench.name not in only:
+            continue
+        for width, height in resolutions:
+            for count in bench.counts:
+                key = case_key(bench, width, height, count)
+                results[key] = run_case(bench, width, height, count, frames, warmup)
+                if log:
+                    r = results[key]
+                    log("%-48s mean %8.3f ms  p50 %8.3f ms  p99 %8.3f ms" % (key, r["mean_ms"], r["p50_ms"], r["p99_ms"]))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "frames": frames,
+            "warmup": warmup,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, metric="p50_ms", threshold=0.10):
+    """
+    Compare two reports.
+
+    :param threshold: allowed relative slowdown before a case is flagged
+    :return: list of (key, baseline_ms, current_ms, ratio) for regressions
+    """
+    regressions = []
+    for key, base in baseline["results"].items():
+        cur = current["results"].get(key)
+        if cur is None or not base[metric]:
+            continue
+        ratio = cur[metric] / base[metric]
+        if ratio > 1.0 + threshold:
+            regressions.append((key, base[metric], cur[metric], ratio))
+    return regressions
+
+
+def _parse_resolutions(text):
+    return [tuple(int(v) for v in res.lower().split("x")) for res in text.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.bench", description=__doc__.split("\n\n")[1])
+    parser.add_argument("--frames", type=int, default=300, help="timed frames per case")
+    parser.add_argument("--warmup", type=int, default=30, help="untimed frames per case")
+    parser.add_argument("--only", help="comma separated benchmark names")
+    parser.add_argument("--resolutions", type=_parse_resolutions, default=RESOLUTIONS,
+                        help="e.g. 640x480,1920x1080")
+    parser.add_argument("--out", help="write the JSON report here")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline JSON report to compare against")
+    parser.add_argument("--metric", default="p50_ms", choices=("mean_ms", "p50_ms", "p99_ms"))
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown (0.10 = 10%%)")
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for bench in BENCHMARKS:
+            print("%-20s %s=%s" % (bench.name, bench.unit, ",".join(str(c) for c in bench.counts)))
+        return 0
+
+    only = set(args.only.split(",")) if args.only else None
+    report = run_all(only, args.resolutions, args.frames, args.warmup)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.metric, args.threshold)
+        for key, base, cur, ratio in regressions:
+            print("REGRESSION %-48s %8.3f -> %8.3f ms (%+.0f%%)" % (key, base, cur, (ratio - 1) * 100))
+        if regressions:
+            return 1
+        print("no regressions (%s, threshold %.0f%%)" % (args.metric, args.threshold * 100))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
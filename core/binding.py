@@ -0,0 +1,200 @@
+"""
+core/binding.py
+
+Live data binding: widgets that follow changing values.
+ - Observable: a value any thread can set() at any rate. Writes only store
+   the newest value and, on the first write since the last frame, queue the
+   Observable once; nothing is locked and no per-write work piles up
+ - Stream: items pushed from any thread are delivered to subscribers as
+   one batch per frame
+ - once per frame the Engine calls flush_bindings(), which visits only the
+   sources written since the last frame: every Observable is coalesced to
+   its latest value, and subscribers run only if that value changed
+ - Observable.bind(widget, attr) sets widget.attr (through an optional
+   transform) and marks the widget dirty, only when the result differs, so
+   static widgets in dirty-rect or layered Scenes repaint only on change
+
+Render-thread work per frame is proportional to the number of sources that
+were written, not to the number of writes.
+
+    cpu = Observable(0.0)
+    cpu.bind(gauge)                                   # gauge.value follows cpu
+    cpu.bind(label, "text", "CPU {:.0%}".format)
+    ...
+    cpu.set(reading)                                  # from a feed thread
+"""
+
+from collections import deque
+
+# sources written since the last flush; appended to from any thread
+_changed = deque()
+
+class Binding:
+    """
+    Keeps target.attr equal to transform(source value). Created by
+    Observable.bind(); call unbind() to stop following the source.
+    """
+    def __init__(self, source, target, attr="value", transform=None):
+        self.source = source
+        self.target = target
+        self.attr = attr
+        self.transform = transform
+        self.updates = 0  # times the target actually changed
+
+    def __call__(self, value):
+        if self.transform is not None:
+            value = self.transform(value)
+        target = self.target
+        if getattr(target, self.attr, None) == value:
+            return
+        setattr(target, self.attr, value)
+        mark_dirty = getattr(target, "mark_dirty", None)
+        if mark_dirty is not None:
+            mark_dirty()
+        self.updates += 1
+
+    def unbind(self):
+        self.source.unsubscribe(self)
+
+
+class Observable:
+    def __init__(self, value=None, name=None):
+        """
+        :param value: initial value
+        :param name: optional label, for debugging
+        """
+        self.name = name
+        self.value = value       # as of the last flush: what bound widgets show
+        self.changes = 0         # flushes in which the value changed
+        self._latest = value     # newest value written by set()
+        self._queued = False
+        self._subscribers = []
+
+    def set(self, value):
+        """
+        Write a new value; safe from any thread, cheap at any rate. Bound
+        widgets see the latest value written before the next frame.
+        """
+        self._latest = value
+        if not self._queued:
+            self._queued = True
+            _changed.append(self)
+
+    def get(self):
+        """
+        The newest value written, which may be ahead of .value until the
+        next flush.
+        """
+        return self._latest
+
+    def subscribe(self, callback):
+        """
+        Call callback(value) on the render thread whenever the value changes.
+        """
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def bind(self, target, attr="value", transform=None):
+        """
+        Keep target.attr in sync with this value (passed through transform),
+        starting now.
+
+        :return: the Binding; unbind() it when the target goes away
+        """
+        binding = Binding(self, target, attr, transform)
+        binding(self.value)
+        return self.subscribe(binding)
+
+    def _flush(self):
+        # clear the flag before reading: a write racing with this flush
+        # queues the Observable again, so it's picked up next frame
+        self._queued = False
+        value = self._latest
+        if value == self.value:
+            return False
+        self.value = value
+        self.changes += 1
+        for callback in tuple(self._subscribers):
+            callback(value)
+        return True
+
+    def __repr__(self):
+        return "Observable(%r%s)" % (self.value, ", name=%r" % self.name if self.name else "")
+
+
+class Stream:
+    """
+    A sequence of items (log lines, samples, events) pushed from any thread
+    and handed to subscribers in one batch per frame.
+    """
+    def __init__(self, maxlen=None, name=None):
+        """
+        :param maxlen: keep only the newest maxlen items between frames
+        """
+        self.name = name
+        self.delivered = 0
+        self._items = deque(maxlen=maxlen)
+        self._queued = False
+        self._subscribers = []
+
+    def push(self, item):
+        self._items.append(item)
+        if not self._queued:
+            self._queued = True
+            _changed.append(self)
+
+    def extend(self, items):
+        self._items.extend(items)
+        if not self._queued:
+            self._queued = True
+            _changed.append(self)
+
+    def subscribe(self, callback):
+        """
+        Call callback(list of items) on the render thread once per frame in
+        which items arrived.
+        """
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _flush(self):
+        self._queued = False
+        items = self._items
+        popleft = items.popleft
+        batch = [popleft() for _ in range(len(items))]
+        if not batch:
+            return False
+        self.delivered += len(batch)
+        for callback in tuple(self._subscribers):
+            callback(batch)
+        return True
+
+
+def pending_bindings():
+    """
+    Number of sources written since the last flush.
+    """
+    return len(_changed)
+
+def flush_bindings():
+    """
+    Deliver everything written since the last call; the Engine does this
+    once per frame, before updating the Scene.
+
+    :return: number of sources whose subscribers ran
+    """
+    popleft = _changed.popleft
+    changed = 0
+    # only what was queued so far: later writes wait for the next frame
+    for _ in range(len(_changed)):
+        if popleft()._flush():
+            changed += 1
+    return changed
@@ -0,0 +1,69 @@
+"""
+core/clock.py
+
+SceneClock: the single source of time for a Scene and its Effects.
+ - advanced by the Scene with each frame's dt (no wall-clock reads)
+ - time_scale for slow motion / fast forward
+ - pause(), resume() and single-step() while paused
+
+Because effects only ever see scene time, headless, faster-than-realtime
+and replayed runs behave exactly like live ones.
+"""
+
+class SceneClock:
+    def __init__(self, time_scale=1.0):
+        """
+        :param time_scale: scene seconds per real second (0.5 = half speed)
+        """
+        self.time_scale = time_scale
+        self.paused = False
+        self.time = 0.0     # scene seconds since reset
+        self.dt = 0.0       # scene seconds advanced by the last tick
+        self.frame = 0      # number of ticks that advanced time
+        self._steps = []
+
+    def reset(self):
+        self.time = 0.0
+        self.dt = 0.0
+        self.frame = 0
+        self._steps.clear()
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+        self._steps.clear()
+
+    def toggle_pause(self):
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def step(self, dt=None):
+        """
+        While paused, advance exactly one frame on the next tick.
+
+        :param dt: scene seconds to advance; defaults to that frame's scaled dt
+        """
+        self._steps.append(dt)
+
+    def tick(self, dt):
+        """
+        Called once per frame by the Scene with the real frame delta.
+
+        :return: scaled dt in scene seconds, or None if time did not advance
+        """
+        if self.paused:
+            if not self._steps:
+                self.dt = 0.0
+                return None
+            step_dt = self._steps.pop(0)
+            dt = dt * self.time_scale if step_dt is None else step_dt
+        else:
+            dt = dt * self.time_scale
+        self.time += dt
+        self.dt = dt
+        self.frame += 1
+        return dt
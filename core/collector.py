@@ -0,0 +1,154 @@
+"""
+core/collector.py
+
+Frame-aware scheduling of Python's cyclic garbage collector.
+
+Allocation-heavy frames (spawning particles, pages, text) trip the automatic
+collector at random points mid-frame, and a full collection of a big heap
+shows up as a hitch. FrameCollector takes over from it:
+ - "defer": automatic collection is off; between frames, idle() runs the
+   generation CPython would have collected, but only if its estimated cost
+   fits the time left (a gen-0 pass is forced if allocations pile up far
+   beyond the threshold, so memory stays bounded)
+ - "disable": automatic collection is off and nothing runs between frames;
+   call collect() yourself (e.g. on scene changes)
+ - None: the automatic collector keeps running as usual; only freeze applies
+ - freeze: after a Scene is set up, its long-lived objects are moved into
+   the permanent generation (gc.freeze()), so later collections skip them
+ - counters of collections and pause durations, and a "gc" span in the
+   Profiler when it is enabled
+"""
+
+import gc
+from time import perf_counter_ns
+
+class FrameCollector:
+    modes = ("defer", "disable", None)
+
+    def __init__(self, mode="defer", budget=0.002, freeze=False, force_factor=10, profiler=None):
+        """
+        :param mode: "defer", "disable" or None (see the module docstring)
+        :param budget: longest pause in seconds idle() may spend per frame
+        :param freeze: gc.freeze() what survives each Scene's setup
+        :param force_factor: run gen 0 regardless of the budget once its
+                             count reaches this many times its threshold
+        :param profiler: Profiler that gets a "gc" span per collection
+        """
+        if mode not in self.modes:
+            raise ValueError(f"unknown gc mode {mode!r}, expected one of {self.modes}")
+        self.mode = mode
+        self.budget = budget
+        self.freeze = freeze
+        self.force_factor = force_factor
+        self.profiler = profiler
+
+        self.collections = [0, 0, 0]  # per generation
+        self.forced = 0               # gen-0 passes run over budget
+        self.skipped = 0              # idle() calls that were due but didn't fit
+        self.pause_total = 0.0        # seconds
+        self.pause_max = 0.0
+        self.last_pause = 0.0
+        self._cost = [0.0, 0.0, 0.0]  # moving average pause per generation
+        self._was_enabled = None
+
+    @property
+    def active(self):
+        return self._was_enabled is not None
+
+    def start(self):
+        """
+        Switch the automatic collector off (unless mode is None); stop()
+        restores it.
+        """
+        if self._was_enabled is None:
+            self._was_enabled = gc.isenabled()
+            if self.mode is not None:
+                gc.disable()
+
+    def stop(self):
+        if self._was_enabled is None:
+            return
+        if self.freeze:
+            gc.unfreeze()
+        if self._was_enabled:
+            gc.enable()
+        self._was_enabled = None
+
+    def scene_starting(self):
+        """
+        Before a Scene is set up: let what the previous one froze be
+        collected again.
+        """
+        if self.freeze:
+            gc.unfreeze()
+
+    def scene_ready(self):
+        """
+        After a Scene is set up: collect the setup garbage now, outside any
+        frame, and freeze the survivors.
+        """
+        if self.freeze:
+            self.collect()
+            gc.freeze()
+
+    def collect(self, generation=2):
+        """
+        Run a collection now and count its pause.
+
+        :return: number of unreachable objects found
+        """
+        start = perf_counter_ns()
+        found = gc.collect(generation)
+        end = perf_counter_ns()
+        pause = (end - start) / 1e9
+        self.collections[generation] += 1
+        self.pause_total += pause
+        self.pause_max = max(self.pause_max, pause)
+        self.last_pause = pause
+        cost = self._cost
+        cost[generation] = pause if not cost[generation] else cost[generation] * 0.8 + pause * 0.2
+        prof = self.profiler
+        if prof is not None and prof.enabled:
+            prof.record(f"gc{generation}", "engine", start, end)
+        return found
+
+    def idle(self, available=None):
+        """
+        Called between frames: run the oldest generation that is due and
+        whose estimated pause fits.
+
+        :param available: seconds to spare before the next frame; capped by
+                          budget (None = the full budget)
+        :return: the generation collected, or None
+        """
+        if self.mode != "defer" or not self.active:
+            return None
+        available = self.budget if available is None else min(available, self.budget)
+        counts = gc.get_count()
+        thresholds = gc.get_threshold()
+        if not thresholds[0] or counts[0] < thresholds[0]:
+            return None
+        # CPython's rule: gen N is due when its count reached its threshold
+        due = [g for g in (2, 1) if counts[g] >= thresholds[g]] + [0]
+        for generation in due:
+            if self._cost[generation] <= available:
+                self.collect(generation)
+                return generation
+        if counts[0] >= thresholds[0] * self.force_factor:
+            self.forced += 1
+            self.collect(0)
+            return 0
+        self.skipped += 1
+        return None
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "collections": tuple(self.collections),
+            "forced": self.forced,
+            "skipped": self.skipped,
+            "pause_total_ms": self.pause_total * 1000.0,
+            "pause_max_ms": self.pause_max * 1000.0,
+            "last_pause_ms": self.last_pause * 1000.0,
+            "frozen": gc.get_freeze_count(),
+        }
@@ -0,0 +1,175 @@
+"""
+core/container.py
+
+EffectContainer: the z-ordered collection of Effects owned by a Scene.
+ - add() inserts in z_order by bisection (ties keep insertion order)
+ - changing an Effect's z_order flags a single re-sort on next iteration
+ - discard() leaves a tombstone that iteration skips; tombstones are
+   compacted lazily once they pile up
+ - find(type) looks effects up by class without scanning every effect
+"""
+
+import itertools
+from bisect import bisect_right
+
+
+def _seq_key(effect):
+    return effect._container_seq
+
+
+class EffectContainer:
+    # compact once at least this many tombstones make up a quarter of the list
+    min_compact = 16
+
+    def __init__(self, effects=()):
+        self._items = []       # effects sorted by (z_order, seq), tombstones included
+        self._keys = []        # parallel (z_order, seq) sort keys
+        self._live = set()
+        self._dead = set()
+        self._by_type = {}     # concrete class -> {effect: None} (insertion ordered)
+        self._type_queries = {}  # queried class -> concrete subclasses present
+        self._seq = itertools.count()
+        self._needs_sort = False
+        self.version = 0       # bumped whenever membership or order changes
+
+        for e in effects:
+            self.add(e)
+
+    def add(self, effect):
+        """
+        Insert an effect at its z_order position.
+        """
+        if effect in self._live:
+            return
+        if self._needs_sort:
+            self._resort()
+        if effect in self._dead:
+            # re-added before its tombstone was compacted away
+            self._compact()
+
+        key = (effect.z_order, next(self._seq))
+        effect._container = self
+        effect._container_seq = key[1]
+        index = bisect_right(self._keys, key)
+        self._keys.insert(index, key)
+        self._items.insert(index, effect)
+        self._live.add(effect)
+
+        cls = type(effect)
+        members = self._by_type.get(cls)
+        if members is None:
+            members = self._by_type[cls] = {}
+            self._type_queries.clear()
+        members[effect] = None
+        self.version += 1
+
+    append = add
+
+    def discard(self, effect):
+        """
+        Remove an effect if present. O(1): leaves a tombstone.
+        """
+        if effect not in self._live:
+            return
+        self._live.discard(effect)
+        self._dead.add(effect)
+        if effect._container is self:
+            effect._container = None
+
+        cls = type(effect)
+        members = self._by_type[cls]
+        del members[effect]
+        if not members:
+            del self._by_type[cls]
+            self._type_queries.clear()
+        self.version += 1
+
+        if len(self._dead) >= self.min_compact and len(self._dead) * 4 >= len(self._items):
+            self._compact()
+
+    def remove(self, effect):
+        """
+        Like list.remove: raises ValueError if the effect isn't present.
+        """
+        if effect not in self._live:
+            raise ValueError("effect not in container")
+        self.discard(effect)
+
+    def clear(self):
+        for e in self._live:
+            if e._container is self:
+                e._container = None
+        self._items.clear()
+        self._keys.clear()
+        self._live.clear()
+        self._dead.clear()
+        self._by_type.clear()
+        self._type_queries.clear()
+        self.version += 1
+
+    def find(self, effect_type):
+        """
+        Effects that are instances of effect_type, in insertion order.
+        Cost is proportional to the number of matching classes, not effects.
+        """
+        classes = self._type_queries.get(effect_type)
+        if classes is None:
+            classes = self._type_queries[effect_type] = [
+                cls for cls in self._by_type if issubclass(cls, effect_type)]
+        if len(classes) == 1:
+            return list(self._by_type[classes[0]])
+        # each class's members are in insertion order: merge them by seq
+        found = [e for cls in classes for e in self._by_type[cls]]
+        found.sort(key=_seq_key)
+        return found
+
+    def _z_changed(self):
+        self._needs_sort = True
+        self.version += 1
+
+    def _resort(self):
+        self._compact()
+        keys = [(e.z_order, e._container_seq) for e in self._items]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._keys = [keys[i] for i in order]
+        self._items = [self._items[i] for i in order]
+        self._needs_sort = False
+
+    def _compact(self):
+        if not self._dead:
+            return
+        dead = self._dead
+        keep = [i for i, e in enumerate(self._items) if e not in dead]
+        self._items = [self._items[i] for i in keep]
+        self._keys = [self._keys[i] for i in keep]
+        dead.clear()
+
+    def __iter__(self):
+        """
+        Iterate live effects in z_order over a snapshot, so effects may be
+        added or removed while iterating.
+        """
+        if self._needs_sort:
+            self._resort()
+        if self._dead:
+            dead = self._dead
+            return iter([e for e in self._items if e not in dead])
+        return iter(self._items[:])
+
+    def __len__(self):
+        return len(self._live)
+
+    def __contains__(self, effect):
+        return effect in self._live
+
+    def __getitem__(self, index):
+        if self._needs_sort:
+            self._resort()
+        self._compact()
+        return self._items[index]
+
+    def __bool__(self):
+        return bool(self._live)
+
+    def __repr__(self):
+        return "EffectContainer(%r)" % list(self)
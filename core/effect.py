@@ -3,15 +3,21 @@ core/effect.py
 
 A robust Base Effect class for Scenes. Provides:
  - z_order for render sorting
- - optional start_delay & duration
+ - optional start_delay & duration, measured on the owning Scene's clock
  - is_active logic
  - kill() method to remove itself from the Scene
- - event handling stubs
+ - event handling stubs, with optional per-event-type subscription
  - bounding-box overlap helper
+ - dirty tracking & bounds reporting for dirty-rect rendering
+ - layer: name of the Scene layer the effect is drawn into
+
+EffectPool recycles effects for spawner-style code, so short-lived effects
+don't churn allocations (and cyclic GC work) every frame.
 """
 
+from collections import deque
+
 import pygame
-import time
 
 class Effect:
     """
@@ -19,43 +25,83 @@ class Effect:
     Extend this to create your own animations, widgets, transitions, etc.
     """
 
+    # Set to True on effects whose pixels only change when mark_dirty() is
+    # called. Non-static effects are assumed to change every frame.
+    static = False
+
+    # Event types handle_event() wants, e.g. (pygame.KEYDOWN,). None means
+    # every event if handle_event is overridden, and no events if it isn't.
+    event_types = None
+
+    # Name of the Scene layer this effect draws into; None is the default
+    # (live) layer. Static effects in a cached layer cost one blit a frame.
+    layer = None
+
     def __init__(self, z_order=0, start_delay=0.0, duration=0.0):
         """
         :param z_order: higher means drawn on top
         :param start_delay: time in seconds to wait before effect becomes active
         :param duration: if > 0, effect auto-removes after this many seconds
         """
+        self._container = None  # EffectContainer holding this effect, if any
+        self._pool = None       # EffectPool this effect returns to when killed
         self.z_order = z_order
         self.start_delay = start_delay
         self.duration = duration
+        self.scene = None  # set by the Scene that owns this effect
 
         self._start_time = None
+        self._local_time = 0.0
         self._is_active = False
         self._should_remove = False
+        self._dirty = True
+
+    @property
+    def z_order(self):
+        return self._z_order
+
+    @z_order.setter
+    def z_order(self, value):
+        self._z_order = value
+        # let the owning container know its order is stale
+        if self._container is not None:
+            self._container._z_changed()
 
     def reset(self):
         """
         Called by the Scene at the start of each run or re-run.
         """
         self._start_time = None
+        self._local_time = 0.0
         self._is_active = False
         self._should_remove = False
+        self._dirty = True
 
     def handle_event(self, event):
         """
         Override to respond to keyboard/mouse events, etc.
+        Set event_types to only receive the events you care about.
         """
         pass
 
+    def subscribes_to(self, event_type):
+        """
+        True if the Scene should route events of this type to handle_event.
+        """
+        if self.event_types is None:
+            return type(self).handle_event is not Effect.handle_event
+        return event_type in self.event_types
+
     def update(self, dt):
         """
         Called each frame with the time delta in seconds.
         """
+        now = self.now(dt)
         # Mark start_time if not already
         if self._start_time is None:
-            self._start_time = time.time()
+            self._start_time = now
 
-        elapsed = time.time() - self._start_time
+        elapsed = now - self._start_time
         # Check if we are past the start_delay
         if not self._is_active and elapsed >= self.start_delay:
             self._is_active = True
@@ -64,17 +110,72 @@ class Effect:
         if self.duration > 0 and elapsed >= (self.start_delay + self.duration):
             self.kill()
 
+    def now(self, dt=0.0):
+        """
+        Current time in seconds: the owning Scene's clock, or (for effects
+        driven directly by another effect) a local clock advanced by dt.
+        """
+        if self.scene is not None:
+            return self.scene.clock.time
+        self._local_time += dt
+        return self._local_time
+
+    def screen_size(self):
+        """
+        Size of the surface the effect renders to: the owning Scene's (see
+        Scene.screen_size()) or, without a Scene, the display's.
+        """
+        if self.scene is not None:
+            return self.scene.screen_size()
+        surface = pygame.display.get_surface()
+        if surface is None:
+            raise RuntimeError("%s needs a Scene or a display surface for the screen size" % type(self).__name__)
+        return surface.get_size()
+
     def draw(self, screen):
         """
         Override to draw your effect. Only draw if is_active is True.
         """
         pass
 
+    def get_bounds(self):
+        """
+        Override to report the screen region this effect draws into, as a
+        pygame.Rect. Returning None means "unknown / anywhere", which forces
+        a full redraw when the Scene is in dirty-rect mode.
+        """
+        return None
+
+    def mark_dirty(self):
+        """
+        Flag that this effect's pixels changed and its bounds must be repainted.
+        """
+        self._dirty = True
+        if self.scene is not None:
+            self.scene.bounds_changed(self)
+
+    def clear_dirty(self):
+        """
+        Called by the Scene once the effect has been repainted.
+        """
+        self._dirty = False
+
+    @property
+    def is_dirty(self):
+        """
+        True if the effect needs repainting this frame.
+        """
+        return self._dirty or not self.static
+
     def kill(self):
         """
-        Mark this effect for removal.
+        Mark this effect for removal. It is dropped from its Scene right away.
         """
         self._should_remove = True
+        if self._container is not None:
+            self._container.discard(self)
+        if self._pool is not None:
+            self._pool.release(self)
 
     @property
     def is_active(self):
@@ -83,9 +184,88 @@ class Effect:
         """
         return self._is_active and not self._should_remove
 
-    def overlaps(self, other, rect_self, rect_other):
+    def overlaps(self, other, rect_self=None, rect_other=None):
         """
-        Bounding box collision helper.
+        Bounding box collision helper. Rects default to each effect's
+        get_bounds(); for "what overlaps this" over a whole Scene use
+        Scene.query_rect(), which goes through the spatial index.
         :return: True if rect_self collides with rect_other
         """
-        return rect_self.colliderect(rect_other)
+        if rect_self is None:
+            rect_self = self.get_bounds()
+        if rect_other is None:
+            rect_other = other.get_bounds()
+        if rect_self is None or rect_other is None:
+            return False
+        return pygame.Rect(rect_self).colliderect(rect_other)
+
+
+class EffectPool:
+    """
+    Keeps released Effects of one kind for reuse.
+
+        sparks = EffectPool(lambda: Spark(0, 0), max_size=500)
+        scene.add_effect(sparks.acquire(x=10, y=20))   # reset() runs on add
+
+    Effects handed out by acquire() go back to the pool by themselves when
+    they kill() (e.g. when their duration runs out); release() does it
+    explicitly. Released effects are reused oldest first.
+    """
+    def __init__(self, factory, max_size=256, prefill=0):
+        """
+        :param factory: callable returning a new Effect
+        :param max_size: released effects beyond this many are dropped
+        :param prefill: create this many effects up front
+        """
+        self.factory = factory
+        self.max_size = max_size
+        self.hits = 0      # acquire() served from the pool
+        self.misses = 0    # acquire() had to call the factory
+        self.dropped = 0   # releases that didn't fit in the pool
+        self._free = deque()
+        self._free_ids = set()
+        for _ in range(prefill):
+            self._put(self.factory())
+
+    def acquire(self, **attrs):
+        """
+        A recycled (or new) Effect with the given attributes set. It is
+        reset() when added to a Scene, or call reset() yourself.
+        """
+        if self._free:
+            effect = self._free.popleft()
+            self._free_ids.discard(id(effect))
+            self.hits += 1
+        else:
+            effect = self.factory()
+            self.misses += 1
+        effect._pool = self
+        for name, value in attrs.items():
+            setattr(effect, name, value)
+        return effect
+
+    def release(self, effect):
+        """
+        Take an effect back: it leaves its Scene and waits for reuse.
+        Releasing an effect twice is harmless.
+        """
+        if id(effect) in self._free_ids:
+            return
+        if effect._container is not None:
+            effect._container.discard(effect)
+        effect.scene = None
+        effect._pool = None
+        if len(self._free) >= self.max_size:
+            self.dropped += 1
+            return
+        self._put(effect)
+
+    def _put(self, effect):
+        self._free.append(effect)
+        self._free_ids.add(id(effect))
+
+    def stats(self):
+        return {"free": len(self._free), "hits": self.hits, "misses": self.misses, "dropped": self.dropped}
+
+    def __len__(self):
+        return len(self._free)
@@ -6,36 +6,129 @@ Manages:
  - main loop
  - optional transitions between Scenes
  - set_scene(index) to jump around
+ - offscreen (headless) rendering and a fixed-step step() driver
+ - optional coalescing of high-frequency events to one per frame
+ - a built-in Profiler (F3 toggles it and its on-screen overlay)
+ - frame recording through a FrameRecorder (start_recording())
+ - optional frame-aware garbage collection (gc_mode, see core/collector.py)
+ - data bindings (core/binding.py) flushed once per frame, before update
+ - run_async(): the same loop as an asyncio coroutine, with coroutines
+   (spawn()) and queued callbacks (call_soon()) held to a per-frame budget
 """
 
+import asyncio
+import os
+from time import perf_counter_ns
+
 import pygame
-import sys
-import time
 
+from core.binding import flush_bindings, pending_bindings
+from core.collector import FrameCollector
+from core.profiler import Profiler, ProfilerOverlay
+from core.recorder import FrameRecorder
 from core.scene import Scene
+from core.tasks import FrameTasks
 from core.transition import FadeTransition, GlitchTransition
 
+# event types that flood the queue during drags and window resizes
+COALESCE_EVENTS = (pygame.MOUSEMOTION, pygame.VIDEORESIZE)
+
+def coalesce_events(events, types=COALESCE_EVENTS):
+    """
+    Keep only the last event of each of the given types, at the position of
+    that last occurrence. Coalesced MOUSEMOTION events get the summed rel.
+    """
+    last = {}
+    for i, event in enumerate(events):
+        if event.type in types:
+            last[event.type] = i
+    if not last:
+        return events
+
+    out = []
+    motion_rel = None
+    for i, event in enumerate(events):
+        if event.type == pygame.MOUSEMOTION and pygame.MOUSEMOTION in last:
+            rx, ry = event.rel
+            motion_rel = (rx, ry) if motion_rel is None else (motion_rel[0] + rx, motion_rel[1] + ry)
+        if event.type not in last:
+            out.append(event)
+        elif last[event.type] == i:
+            if event.type == pygame.MOUSEMOTION and motion_rel != tuple(event.rel):
+                event = pygame.event.Event(pygame.MOUSEMOTION, {**event.dict, "rel": motion_rel})
+            out.append(event)
+    return out
+
 class Engine:
-    def __init__(self, width=800, height=600, title="CybrHUD Demo", fps=60):
+    def __init__(self, width=800, height=600, title="CybrHUD Demo", fps=60, offscreen=False,
+                 coalesce=False, profile=False, gc_mode=None, gc_budget=0.002, gc_freeze=False,
+                 async_budget=0.004):
         """
         :param fps: target frames per second
+        :param offscreen: render into a plain Surface instead of a window.
+                          Uses the SDL dummy video driver unless another one
+                          is set, so it works on machines with no display.
+        :param coalesce: deliver at most one of each coalesce_types event
+                         (by default MOUSEMOTION, VIDEORESIZE) per frame
+        :param profile: start with the profiler enabled
+        :param gc_mode: None leaves Python's garbage collector alone;
+                        "defer" runs it between frames when it fits in
+                        gc_budget, "disable" never runs it automatically
+        :param gc_budget: longest garbage collection pause per frame, seconds
+        :param gc_freeze: gc.freeze() each Scene's objects once it is set up;
+                          with gc_mode None the automatic collector keeps
+                          running, it just skips the frozen objects
+        :param async_budget: seconds per frame for call_soon() callbacks, and
+                             for throttled coroutines between frames
         """
+        self.offscreen = offscreen
+        self.coalesce = coalesce
+        self.coalesce_types = COALESCE_EVENTS
+        if offscreen:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
         pygame.init()
         self.width = width
         self.height = height
-        self.screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
-        pygame.display.set_caption(title)
+        if offscreen:
+            self.screen = pygame.Surface((width, height))
+        else:
+            self.screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
+            pygame.display.set_caption(title)
         self.clock = pygame.time.Clock()
         self.fps = fps
 
         self.scenes = []
         self.active_scene_index = 0
         self.running = False
+        self.frame_count = 0
+
+        # per-effect timing; costs nothing measurable while disabled
+        self.profiler = Profiler(enabled=profile)
+        self.profiler_overlay = ProfilerOverlay(self.profiler)
+        self.show_profiler = True   # draw the overlay while profiling
+        self.profiler_key = pygame.K_F3
+
+        self.recorder = None  # FrameRecorder fed after every drawn frame
+
+        # takes over from the automatic garbage collector while running,
+        # or only freezes each Scene's objects (gc_freeze without gc_mode)
+        self.collector = None
+        if gc_mode is not None or gc_freeze:
+            self.collector = FrameCollector(gc_mode, budget=gc_budget, freeze=gc_freeze,
+                                            profiler=self.profiler)
+
+        # coroutines and callbacks from async feeds (run_async())
+        self.tasks = FrameTasks(budget=async_budget)
 
         # optional transitions
         self.transition_in = None  # e.g. FadeTransition(...) for each scene
         self.transition_out = None
 
+        # what is currently playing: None, "in", "scene" or "out"
+        self._stage = None
+        self._transition_scene = None
+        self._transition_time = 0.0
+
     def add_scene(self, scene: Scene):
         self.scenes.append(scene)
 
@@ -44,47 +137,298 @@ class Engine:
         Jump to a specific scene index, if valid.
         """
         if 0 <= index < len(self.scenes):
+            if self._stage is not None:
+                self.tasks.cancel(self.current_scene)
             self.active_scene_index = index
+            self._stage = None
+
+    @property
+    def current_scene(self):
+        """
+        The Scene being played, or None once all Scenes are done.
+        """
+        if self.active_scene_index < len(self.scenes):
+            return self.scenes[self.active_scene_index]
+        return None
 
     def run(self):
+        """
+        Play all Scenes in order. Returns when they are done or the user quits.
+        Offscreen engines render as fast as possible with a fixed 1/fps dt.
+        """
+        self.running = True
+        try:
+            while self._advance(self._tick()):
+                pass
+        finally:
+            if self.collector is not None:
+                self.collector.stop()
+            self.tasks.close()
+        self.stop_recording()
+        if not self.offscreen:
+            pygame.quit()
+
+    async def run_async(self):
+        """
+        Coroutine version of run(), for use inside an asyncio program:
+
+            asyncio.run(engine.run_async())
+
+        Between frames it awaits the next frame deadline, so the event loop
+        serves I/O meanwhile instead of the Engine sleeping in clock.tick().
+        Offscreen engines yield to the loop once per frame and don't wait.
+        """
+        loop = asyncio.get_running_loop()
+        tasks = self.tasks
+        tasks.attach(loop)
+        self.running = True
+        period = 1.0 / self.fps
+        last = deadline = loop.time()
+        try:
+            while True:
+                now = loop.time()
+                dt = period if self.offscreen else now - last
+                last = now
+                if not self._advance(dt):
+                    break
+                now = loop.time()
+                if self.offscreen:
+                    tasks.open_slice(now + tasks.budget)
+                    await asyncio.sleep(0)
+                    continue
+                # a frame that ran long pushes the schedule back instead of
+                # making the following frames rush to catch up
+                deadline = max(deadline + period, now)
+                tasks.open_slice(min(deadline, now + tasks.budget))
+                await asyncio.sleep(deadline - now)
+        finally:
+            if self.collector is not None:
+                self.collector.stop()
+            await tasks.detach()
+        self.stop_recording()
+        if not self.offscreen:
+            pygame.quit()
+
+    def spawn(self, coro, scene=None):
+        """
+        Run a coroutine on the event loop of run_async() (coroutines spawned
+        before it starts wait for it). Scene.spawn() ties it to a Scene.
+
+        :param scene: cancel the task when this Scene ends
+        :return: the asyncio.Task, or None until the loop runs
+        """
+        return self.tasks.spawn(coro, scene)
+
+    def call_soon(self, callback, *args):
+        """
+        Run callback(*args) at the start of a coming frame, within the
+        per-frame async budget. Safe to call from other threads.
+        """
+        self.tasks.call_soon(callback, *args)
+
+    async def throttle(self):
+        """
+        Await this between chunks of work in a long-running coroutine: it
+        only resumes while the current between-frames slice lasts.
+        """
+        await self.tasks.throttle()
+
+    def step(self, n_frames=1, dt=None):
+        """
+        Deterministically advance n_frames of update + draw, without sleeping.
+
+        :param dt: seconds per frame, defaults to 1/fps
+        :return: number of frames actually advanced (fewer if Scenes ran out)
+        """
+        if dt is None:
+            dt = 1.0 / self.fps
         self.running = True
+        frames = 0
+        while frames < n_frames and self._advance(dt):
+            frames += 1
+        return frames
 
-        while self.running and self.active_scene_index < len(self.scenes):
+    def _tick(self):
+        if self.offscreen:
+            # no frame cap: measure only, always feed a fixed dt
+            self.clock.tick()
+            return 1.0 / self.fps
+        return self.clock.tick(self.fps)/1000.0
+
+    def _advance(self, dt):
+        """
+        Run one frame of whatever is playing. Returns False when done.
+        """
+        if not self.running:
+            return False
+        if self._stage is None and not self._start_scene():
+            return False
+        frame_start = perf_counter_ns()
+
+        prof = self.profiler
+        profiling = prof.enabled
+        if profiling:
+            prof.begin_frame()
+
+        events = self._poll_events()
+        if not self.running:
+            return False
+
+        if self.tasks.queued:
+            t = perf_counter_ns()
+            self.tasks.run_callbacks()
+            if profiling and prof.enabled:
+                prof.mark("async", "engine", t)
+        if pending_bindings():
+            t = perf_counter_ns()
+            flush_bindings()
+            if profiling and prof.enabled:
+                prof.mark("bindings", "engine", t)
+
+        if self._stage == "scene":
             scene = self.scenes[self.active_scene_index]
-            scene.reset(self)
-
-            # Optional transition in
-            if self.transition_in:
-                self._play_transition(self.transition_in)
-
-            # run scene
-            start_time = time.time()
-            while scene.playing and self.running:
-                dt = self.clock.tick(self.fps)/1000.0
-
-                # handle events
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        self.running = False
-                    elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                        self.running = False
+            if profiling and prof.enabled:
+                self._profiled_scene_frame(scene, events, dt)
+            else:
+                for event in events:
                     scene.handle_event(event)
-
                 scene.update(dt)
-                scene.draw(self.screen)
-                pygame.display.flip()
+                self._present(scene.draw(self.screen))
+            if not scene.playing:
+                self._end_scene()
+        else:
+            self._transition_frame(dt)
+
+        if self.recorder is not None:
+            self.recorder.capture(self.screen)
+        if self.collector is not None:
+            self._collect_garbage(frame_start)
+        if profiling and prof.enabled:
+            prof.end_frame()
+        self.frame_count += 1
+        return True
+
+    def _profiled_scene_frame(self, scene, events, dt):
+        """
+        Same as the plain scene frame, with each engine section timed.
+        """
+        prof = self.profiler
+        t = perf_counter_ns()
+        for event in events:
+            scene.handle_event(event)
+        t = prof.mark("events", "engine", t)
+        scene.update(dt)
+        t = prof.mark("update", "engine", t)
+        rects = scene.draw(self.screen)
+        t = prof.mark("draw", "engine", t)
+        if self.show_profiler:
+            overlay = self.profiler_overlay
+            overlay.draw(self.screen)
+            if rects is not None:
+                bounds = overlay.get_bounds()
+                rects = rects + [bounds]
+                scene.invalidate(bounds)
+        self._present(rects)
+        prof.mark("present", "engine", t)
+
+    def _collect_garbage(self, frame_start):
+        """
+        Give the collector whatever is left of this frame's time slot.
+        Offscreen engines don't sleep between frames, so they get the budget.
+        """
+        collector = self.collector
+        if self.offscreen:
+            collector.idle()
+        else:
+            spent = (perf_counter_ns() - frame_start) / 1e9
+            collector.idle(1.0 / self.fps - spent)
+
+    def start_recording(self, recorder):
+        """
+        Record every frame from now on.
 
-            # Optional transition out
-            if self.running and self.transition_out:
-                self._play_transition(self.transition_out)
+        :param recorder: a FrameRecorder, or a path which gets a default
+                         PNG recorder (e.g. "out/frame_%05d.png")
+        """
+        self.stop_recording()
+        if not isinstance(recorder, FrameRecorder):
+            recorder = FrameRecorder(recorder, fps=self.fps)
+        self.recorder = recorder
+        return recorder
 
-            # next scene
-            self.active_scene_index += 1
+    def stop_recording(self):
+        """
+        Stop recording and wait for pending frames to be written.
 
-        pygame.quit()
-        sys.exit()
+        :return: the recorder's stats(), or None if nothing was recording
+        """
+        recorder, self.recorder = self.recorder, None
+        if recorder is None:
+            return None
+        recorder.stop()
+        return recorder.stats()
 
-    def _play_transition(self, transition_factory):
+    def toggle_profiler(self):
+        """
+        Turn the profiler (and its overlay) on or off.
+        """
+        self.profiler.toggle()
+        scene = self.current_scene
+        if scene is not None:
+            # the overlay was painted over the scene; repaint everything
+            scene.invalidate()
+
+    def _poll_events(self):
+        # an offscreen engine may run without any video system at all
+        if not pygame.display.get_init():
+            return []
+        events = pygame.event.get()
+        if self.coalesce:
+            events = coalesce_events(events, self.coalesce_types)
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                self.running = False
+            elif event.type == pygame.KEYDOWN and event.key == self.profiler_key:
+                self.toggle_profiler()
+        return events
+
+    def _start_scene(self):
+        if self.active_scene_index >= len(self.scenes):
+            self.running = False
+            if self.collector is not None:
+                self.collector.stop()
+            return False
+        scene = self.scenes[self.active_scene_index]
+        collector = self.collector
+        if collector is not None:
+            collector.start()
+            collector.scene_starting()
+        scene.reset(self)
+        if collector is not None:
+            collector.scene_ready()
+
+        # Optional transition in
+        if self.transition_in:
+            self._begin_transition(self.transition_in, "in")
+        else:
+            self._stage = "scene"
+        return True
+
+    def _end_scene(self):
+        # Optional transition out
+        if self.running and self.transition_out:
+            self._begin_transition(self.transition_out, "out")
+        else:
+            self._next_scene()
+
+    def _next_scene(self):
+        self.tasks.cancel(self.current_scene)
+        self._stage = None
+        self.active_scene_index += 1
+
+    def _begin_transition(self, transition_factory, stage):
         """
         Plays a transition for e.g. 1 second. The transition_factory
         is a function that returns an Effect or a list of Effects
@@ -94,30 +438,36 @@ class Engine:
         transition_effect = transition_factory()
         if not isinstance(transition_effect, list):
             transition_effect = [transition_effect]
-        temp_scene = Scene(effects=transition_effect, duration=0)
-        temp_scene.reset(self)
-
-        # run until all are done or user quits
-        # we'll define a short max time
-        max_time = 2.0
-        start_t = time.time()
+        self._transition_scene = Scene(effects=transition_effect, duration=0)
+        self._transition_scene.reset(self)
+        self._transition_time = 0.0
+        self._stage = stage
 
-        while True:
-            dt = self.clock.tick(self.fps)/1000.0
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                    self.running = False
+    def _transition_frame(self, dt):
+        temp_scene = self._transition_scene
+        temp_scene.update(dt)
+        self._transition_time += dt
 
-            if not self.running:
-                break
-
-            temp_scene.update(dt)
+        # if all transitions are done or we exceed a short max time
+        max_time = 2.0
+        if all(e._should_remove for e in temp_scene.effects) or self._transition_time >= max_time:
+            self._transition_scene = None
+            if self._stage == "in":
+                self._stage = "scene"
+            else:
+                self._next_scene()
+            return
 
-            # if all transitions are done or we exceed max_time
-            if all(e._should_remove for e in temp_scene.effects) or (time.time()-start_t>=max_time):
-                break
+        self._present(temp_scene.draw(self.screen))
 
-            temp_scene.draw(self.screen)
+    def _present(self, rects):
+        """
+        Push the frame to the display: only the given rects if the Scene
+        reported them (dirty-rect mode), otherwise the whole screen.
+        """
+        if self.offscreen:
+            return
+        if rects is None:
             pygame.display.flip()
+        else:
+            pygame.display.update(rects)
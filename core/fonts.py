@@ -0,0 +1,114 @@
+"""
+core/fonts.py
+
+Shared font registry and rendered-text cache:
+ - get_font() loads each (name/path, size, bold) font once
+ - TextCache: LRU of rendered text surfaces with a memory budget and
+   hit/miss counters
+ - render_text() renders through a shared default TextCache
+
+Fonts returned by get_font() are shared; don't call set_bold/set_italic etc.
+on them, ask get_font() for the variant instead.
+"""
+import os
+from collections import OrderedDict
+
+import pygame
+
+FONT_FILE_EXTENSIONS = (".ttf", ".otf", ".ttc", ".fon")
+
+_fonts = {}
+
+def get_font(name=None, size=24, bold=False):
+    """
+    Return the shared pygame Font for (name, size, bold), loading it on first use.
+
+    :param name: path to a font file (e.g. "assets/fonts/Orbitron-Regular.ttf")
+                 or a system font name such as "Arial"; None for the default
+    """
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        if name and os.path.splitext(name)[1].lower() in FONT_FILE_EXTENSIONS:
+            font = pygame.font.Font(name, size)
+            font.set_bold(bold)
+        else:
+            font = pygame.font.SysFont(name, size, bold=bold)
+        _fonts[key] = font
+    return font
+
+
+def clear_fonts():
+    """
+    Drop every loaded font (e.g. after pygame.font.quit()).
+    """
+    _fonts.clear()
+
+
+class TextCache:
+    """
+    LRU cache of rendered text surfaces, keyed by (font, text, color, antialias).
+    Surfaces are evicted least-recently-used first once their total pixel
+    memory exceeds max_bytes.
+    """
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def render(self, font, text, color, antialias=True):
+        """
+        Same as font.render(text, antialias, color), but cached.
+        The returned surface is shared: blit it, don't draw on it.
+        """
+        key = (font, text, tuple(color), antialias)
+        surf = self._entries.get(key)
+        if surf is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        size = surf.get_width() * surf.get_height() * surf.get_bytesize()
+        if size <= self.max_bytes:
+            self._entries[key] = surf
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, old = self._entries.popitem(last=False)
+                self.bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+                self.evictions += 1
+        return surf
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        """
+        :return: dict of entries, bytes, hits, misses, evictions and hit_rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+default_text_cache = TextCache()
+
+def render_text(font, text, color, antialias=True):
+    """
+    Render text through the shared default TextCache.
+    """
+    return default_text_cache.render(font, text, color, antialias)
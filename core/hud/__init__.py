@@ -8,6 +8,9 @@ Subpackage containing HUD element classes for the Cyberpunk HUD Toolkit.
 from .circular import CircularProgress   # Expected circular progress indicator
 from .radar import RadarSweep              # Expected radar sweep element
 from .panel import Panel, SlidingPanel     # Expected panel and sliding panel elements
-from .text import TextBlock, DataBlock       # Expected text rendering elements
-from .shapes import ShapeRenderer          # Expected vector shape renderer (e.g., grids, crosshairs)
+from .text import TextBlock, DataBlock     # Expected text rendering elements
+from .shapes import HexGrid                # Expected vector shape renderer (e.g., grids, crosshairs)
 from .particles import ParticleEmitter     # Expected particle effect class
+from .matrix import MatrixRain             # Falling glyph columns
+from .fireworks import Fireworks           # Pooled rockets and spark bursts
+from .console import Console               # Ring-buffer log view with an input prompt
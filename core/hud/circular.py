@@ -2,13 +2,44 @@
 core/hud/circular.py
 
 A Circular progress meter or gauge, with an optional glow effect.
+
+The value is quantized to `steps` levels. For each level the ring, the glow
+halo and the progress arc are composited with NumPy into one sprite, kept
+in an LRU cache (large enough for every level) shared by every gauge of the
+same style. Supersampled (anti-aliased) coverage of every level comes from
+a per-style table built once in reset(), so a new level costs about a
+millisecond instead of a full supersampled pass. A gauge whose quantized value
+doesn't change costs a single blit and is never repainted in dirty-rect or
+layered rendering.
 """
 import math
+from collections import OrderedDict
+
+import numpy as np
 import pygame
 from core.effect import Effect
 
 class CircularProgress(Effect):
-    def __init__(self, x, y, radius=50, value=0.0, color=(0,255,255), bg_color=(50,50,50), thickness=8):
+    static = True  # only repainted when the quantized value/colors change
+
+    # (style, step) -> sprite and shape -> per-sample geometry, shared by all gauges
+    _sprites = OrderedDict()
+    _geometry = OrderedDict()
+    cache_size = 512
+    geometry_cache_size = 16
+
+    def __init__(self, x, y, radius=50, value=0.0, color=(0,255,255), bg_color=(50,50,50), thickness=8,
+                 steps=100, glow=0, glow_alpha=90, antialias=True, supersample=4, prerender=False):
+        """
+        :param value: progress 0..1
+        :param steps: distinct arc lengths; value is rounded to the nearest 1/steps
+        :param glow: width in pixels of the glow halo around the arc (0 = none)
+        :param glow_alpha: opacity of the halo right next to the arc
+        :param antialias: supersample the edges of the ring and arc
+        :param supersample: samples per pixel along each axis when antialiasing
+        :param prerender: render every level's sprite in reset() rather than
+                          on first use (about a millisecond per level)
+        """
         super().__init__()
         self.x = x
         self.y = y
@@ -17,23 +48,181 @@ class CircularProgress(Effect):
         self.color = color
         self.bg_color = bg_color
         self.thickness = thickness
+        self.steps = steps
+        self.glow = glow
+        self.glow_alpha = glow_alpha
+        self.antialias = antialias
+        self.supersample = supersample
+        self.prerender = prerender
         self.speed = 0.0  # if you want to animate the value
+        self._drawn_state = None
+
+    def reset(self):
+        super().reset()
+        # the per-style geometry is the expensive part: build it before the
+        # first frame; each level's sprite is then cheap to render on demand
+        self._sample_geometry(self._style())
+        if self.prerender:
+            self.prerender_levels()
+
+    def prerender_levels(self):
+        """
+        Render and cache the sprite of every level of the current style.
+        """
+        for step in range(self.steps + 1):
+            self.sprite(step)
 
     def update(self, dt):
+        super().update(dt)
         # Example: if you wanted to animate the value
         self.value += self.speed * dt
         self.value = max(0.0, min(1.0, self.value))
 
+    @property
+    def step(self):
+        """
+        The value quantized to 0..steps.
+        """
+        return int(round(max(0.0, min(1.0, self.value)) * self.steps))
+
+    def _style(self):
+        return (self.radius, self.thickness, tuple(self.color), tuple(self.bg_color), self.steps,
+                self.glow, self.glow_alpha, self.supersample if self.antialias else 1)
+
+    @property
+    def is_dirty(self):
+        return super().is_dirty or self._drawn_state != (self.step, self._style())
+
+    def get_bounds(self):
+        r = self.radius + self.glow
+        return pygame.Rect(self.x - r, self.y - r, r*2 + 1, r*2 + 1)
+
+    def sprite(self, step=None):
+        """
+        The cached ring + halo + arc sprite for the current quantized value
+        (or for the given step).
+        """
+        key = (self._style(), self.step if step is None else step)
+        sprites = self._sprites
+        sprite = sprites.get(key)
+        if sprite is None:
+            sprite = sprites[key] = self._render(*key)
+            # never evict below one full level table of this gauge
+            while len(sprites) > max(self.cache_size, self.steps + 1):
+                sprites.popitem(last=False)
+        else:
+            sprites.move_to_end(key)
+        return sprite
+
+    @classmethod
+    def _sample_geometry(cls, style):
+        """
+        Everything about the sprite that depends on neither the value nor
+        the colors: ring coverage, and per pixel the arc and halo coverage
+        at every step.
+
+        Each sub-pixel sample is covered from the first step whose sweep
+        reaches its angle on, so counting samples per (step, pixel) and
+        summing over steps gives the coverage table of all levels in one
+        pass. Only pixels the arc or halo can reach are kept.
+        """
+        radius, thickness, color, bg_color, steps, glow, glow_alpha, ss = style
+        # colors and glow_alpha only matter when compositing a level
+        key = (radius, thickness, steps, glow, ss)
+        geometry = cls._geometry.get(key)
+        if geometry is not None:
+            cls._geometry.move_to_end(key)
+            return geometry
+
+        extent = radius + glow
+        size = extent*2 + 1
+        samples = ss * ss
+
+        # sample positions relative to the center, ss x ss per pixel
+        offsets = (np.arange(size * ss) + 0.5) / ss - 0.5 - extent
+        dy, dx = np.meshgrid(offsets, offsets, indexing="ij")
+        dist = np.hypot(dx, dy)
+        # like pygame.draw.arc: from the bottom, counterclockwise on screen
+        along = np.mod(np.arctan2(-dy, dx) + math.pi / 2, 2 * math.pi).astype(np.float32)
+        # first step covering each sample: sweep(step) >= along
+        sweeps = np.array([np.float32(2 * math.pi * step / steps) for step in range(steps + 1)])
+        first_step = np.searchsorted(sweeps, along, side="left")
+
+        def per_pixel(values):
+            # (size*ss, size*ss) -> (size*size, ss*ss)
+            return values.reshape(size, ss, size, ss).swapaxes(1, 2).reshape(size*size, samples)
+
+        def coverage_table(pixels, weights):
+            # (steps+1, len(pixels)) cumulative coverage of the given pixels
+            n = len(pixels)
+            index = per_pixel(first_step)[pixels] * n + np.arange(n)[:, None]
+            counts = np.bincount(index.ravel(), weights.ravel(), minlength=(steps + 2) * n)
+            table = counts.astype(np.float32).reshape(steps + 2, n)[:-1]
+            np.cumsum(table, axis=0, out=table)
+            table /= samples
+            return table
+
+        inner = radius - thickness
+        in_band = per_pixel((dist >= inner) & (dist <= radius))
+        if glow > 0:
+            beyond = np.maximum(inner - dist, dist - radius)
+            falloff = per_pixel(np.clip(1.0 - beyond / glow, 0.0, 1.0).astype(np.float32))
+            reach = np.flatnonzero(in_band.any(axis=-1) | falloff.any(axis=-1))
+            halo = coverage_table(reach, falloff[reach])
+        else:
+            reach = np.flatnonzero(in_band.any(axis=-1))
+            halo = None
+        # everything below is per pixel of `reach`; the rest stays transparent
+        ring = in_band[reach].mean(axis=-1, dtype=np.float32)
+        arc = coverage_table(reach, in_band[reach].astype(np.float32))
+
+        geometry = cls._geometry[key] = (size, reach, ring, arc, halo)
+        while len(cls._geometry) > cls.geometry_cache_size:
+            cls._geometry.popitem(last=False)
+        return geometry
+
+    @classmethod
+    def _render(cls, style, step):
+        radius, thickness, color, bg_color, steps, glow, glow_alpha, ss = style
+        size, reach, ring, arc_table, halo_table = cls._sample_geometry(style)
+        arc = arc_table[step]
+        if halo_table is not None and step > 0:
+            halo = halo_table[step] * np.float32(glow_alpha / 255.0)
+        else:
+            halo = np.zeros_like(arc)
+
+        # composite halo, then the background ring, then the arc ("over"),
+        # channel planes first so NumPy loops run along the pixels
+        rgb = np.zeros((3, len(reach)), dtype=np.float32)
+        alpha = np.zeros(len(reach), dtype=np.float32)
+        for layer_color, layer_alpha in ((color, halo), (bg_color, ring - arc), (color, arc)):
+            layer_rgb = np.asarray(layer_color[:3], dtype=np.float32)[:, None]
+            rgb = layer_rgb * layer_alpha + rgb * (1.0 - layer_alpha)
+            alpha = layer_alpha + alpha * (1.0 - layer_alpha)
+        covered = alpha > 0
+        rgb[:, covered] /= alpha[covered]
+
+        # scatter into full planes, transposed to surfarray's (x, y) order
+        plane = np.zeros(size * size, dtype=np.uint8)
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+        pixels = pygame.surfarray.pixels3d(sprite)
+        for channel in range(3):
+            plane[reach] = np.round(rgb[channel])
+            pixels[..., channel] = plane.reshape(size, size).T
+        del pixels
+        plane[reach] = np.round(alpha * 255)
+        pixels = pygame.surfarray.pixels_alpha(sprite)
+        pixels[...] = plane.reshape(size, size).T
+        del pixels
+        if pygame.display.get_surface():
+            sprite = sprite.convert_alpha()
+        # the hole in the middle is fully transparent: RLE lets blits skip it.
+        # Encoding happens on the first blit, so do that here, once.
+        sprite.set_alpha(255, pygame.RLEACCEL)
+        pygame.Surface((1, 1)).blit(sprite, (0, 0))
+        return sprite
+
     def draw(self, screen):
-        # Draw background ring
-        pygame.draw.circle(screen, self.bg_color, (self.x, self.y), self.radius, self.thickness)
-
-        # Draw progress arc
-        start_angle = -math.pi / 2
-        end_angle = start_angle + 2*math.pi * self.value
-        rect = pygame.Rect(self.x - self.radius, self.y - self.radius, self.radius*2, self.radius*2)
-        pygame.draw.arc(screen, self.color, rect, start_angle, end_angle, self.thickness)
-
-        # Optionally add a glow effect
-        # e.g. draw a bigger circle with alpha
-        # (leaving it out for brevity)
+        self._drawn_state = (self.step, self._style())
+        r = self.radius + self.glow
+        screen.blit(self.sprite(), (self.x - r, self.y - r))
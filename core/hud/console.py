@@ -0,0 +1,314 @@
+"""
+core/hud/console.py
+
+A scrolling console / log view with an optional input prompt.
+
+ - the log is a fixed-capacity ring buffer: once full, the oldest lines are
+   overwritten, so memory stays flat however much is logged
+ - write() is thread-safe: lines go into a queue that update() drains once
+   per frame, so background producers can push tens of thousands of lines
+   per second; only the last `capacity` queued lines are ever kept
+ - the visible lines are composed into a cached viewport Surface. When the
+   view moves by a few lines the viewport is scrolled in place and only
+   the newly exposed lines are rendered; rendered lines are kept in a small
+   LRU cache, so scrolling back and forth doesn't re-render them
+ - the console is static: nothing is repainted while no lines arrive, the
+   view doesn't move and the prompt doesn't change
+"""
+from collections import OrderedDict, deque
+
+import pygame
+from core.effect import Effect
+from core.fonts import get_font, render_text
+
+class Console(Effect):
+    static = True  # only repainted when the view, the prompt or the cursor change
+
+    def __init__(self, x, y, width, height, capacity=10000, font_path=None, font_size=20,
+                 text_color=(0,255,0), bg_color=(10,10,10), padding=5, prompt="> ",
+                 on_submit=None, cursor_interval=0.5):
+        """
+        :param capacity: lines kept for scrollback
+        :param text_color: default color of log lines (write() can override it)
+        :param prompt: text before the input line; None for a read-only log
+        :param on_submit: called with each line entered at the prompt;
+                          by default the line is written to the log
+        :param cursor_interval: seconds between cursor blinks
+        """
+        super().__init__()
+        self.rect = pygame.Rect(x, y, width, height)
+        self.capacity = capacity
+        self.font_path = font_path
+        self.font_size = font_size
+        self.text_color = text_color
+        self.bg_color = bg_color
+        self.padding = padding
+        self.prompt = prompt
+        self.on_submit = on_submit
+        self.cursor_interval = cursor_interval
+        self.event_types = (pygame.KEYDOWN,) if prompt is not None else ()
+
+        # ring buffer of (text, color); line number n lives in slot n % capacity
+        self._ring = [None] * capacity
+        self.total = 0          # lines written so far; the newest is line total - 1
+        self._queue = deque()   # written, not yet appended (filled from any thread)
+
+        self.scroll_offset = 0  # lines above the bottom; 0 follows new output
+        self.input_buffer = ""
+        self._cursor_visible = True
+        self._cursor_timer = 0.0
+
+        self._font = None
+        self._lines = OrderedDict()    # line number -> rendered Surface
+        self._viewport = None          # composed log area
+        self._viewport_key = None      # style it was composed with
+        self._view = None              # (first, end) line numbers it shows
+        self._drawn_state = None
+
+    @property
+    def count(self):
+        """
+        Lines currently held in the ring buffer.
+        """
+        return min(self.total, self.capacity)
+
+    @property
+    def line_height(self):
+        return self._get_font().get_linesize()
+
+    @property
+    def rows(self):
+        """
+        Log lines that fit in the view.
+        """
+        height = self.rect.height - 2 * self.padding
+        if self.prompt is not None:
+            height -= self.line_height
+        return max(0, height // self.line_height)
+
+    def _get_font(self):
+        if self._font is None:
+            self._font = get_font(self.font_path or "Courier", self.font_size)
+        return self._font
+
+    def reset(self):
+        """
+        Start over with an empty log, like a fresh console, whenever the
+        Scene (re)starts.
+        """
+        super().reset()
+        self._font = None
+        self.clear()
+        self.input_buffer = ""
+        self._cursor_visible = True
+        self._cursor_timer = 0.0
+
+    # --- log ---------------------------------------------------------------
+
+    def write(self, text, color=None):
+        """
+        Queue text for the log; safe to call from any thread. Multi-line
+        text becomes several lines. Lines show up on the next update().
+        """
+        if "\n" in text:
+            self._queue.extend([(line, color) for line in text.split("\n")])
+        else:
+            self._queue.append((text, color))
+
+    def write_lines(self, lines, color=None):
+        """
+        Queue many lines at once; safe to call from any thread.
+        """
+        self._queue.extend([(line, color) for line in lines])
+
+    def clear(self):
+        """
+        Drop every line, queued ones included.
+        """
+        self._queue.clear()
+        self._ring = [None] * self.capacity
+        self.total = 0
+        self.scroll_offset = 0
+        self._lines.clear()
+        self._view = None
+
+    def lines(self, last=None):
+        """
+        Text of the lines in the buffer, oldest first.
+
+        :param last: only the newest `last` lines
+        """
+        count = self.count if last is None else min(last, self.count)
+        ring, cap = self._ring, self.capacity
+        return [ring[n % cap][0] for n in range(self.total - count, self.total)]
+
+    def _drain(self):
+        """
+        Move what the producers queued into the ring buffer.
+        """
+        queue = self._queue
+        pending = len(queue)
+        if not pending:
+            return 0
+        popleft = queue.popleft
+        if pending > self.capacity:
+            # these would be overwritten right away: count them, skip them
+            skipped = pending - self.capacity
+            for _ in range(skipped):
+                popleft()
+            self.total += skipped
+            pending = self.capacity
+        items = [popleft() for _ in range(pending)]
+
+        ring, cap = self._ring, self.capacity
+        start = self.total % cap
+        head = min(pending, cap - start)
+        ring[start:start + head] = items[:head]
+        ring[:pending - head] = items[head:]
+        self.total += pending
+        if self.scroll_offset:
+            # scrolled back: keep looking at the same lines
+            self.scroll_offset = min(self.scroll_offset + pending, self.max_scroll)
+        return pending
+
+    @property
+    def max_scroll(self):
+        return max(0, self.count - self.rows)
+
+    def scroll(self, lines):
+        """
+        Scroll back (positive) or toward the newest output (negative).
+        """
+        self.scroll_offset = max(0, min(self.scroll_offset + lines, self.max_scroll))
+
+    def view(self):
+        """
+        (first, end) line numbers of the visible log lines.
+        """
+        end = self.total - self.scroll_offset
+        return max(self.total - self.count, end - self.rows), end
+
+    # --- input -------------------------------------------------------------
+
+    def handle_event(self, event):
+        if not self.is_active or self.prompt is None:
+            return
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_RETURN:
+            text = self.input_buffer.strip()
+            self.input_buffer = ""
+            if text:
+                if self.on_submit is not None:
+                    self.on_submit(text)
+                else:
+                    self.write(text)
+            self.scroll_offset = 0
+        elif event.key == pygame.K_BACKSPACE:
+            self.input_buffer = self.input_buffer[:-1]
+        elif event.key == pygame.K_UP:
+            self.scroll(1)
+        elif event.key == pygame.K_DOWN:
+            self.scroll(-1)
+        elif event.key == pygame.K_PAGEUP:
+            self.scroll(self.rows)
+        elif event.key == pygame.K_PAGEDOWN:
+            self.scroll(-self.rows)
+        elif event.unicode and event.unicode.isprintable():
+            self.input_buffer += event.unicode
+
+    def update(self, dt):
+        super().update(dt)
+        self._drain()
+        if not self.is_active or self.prompt is None:
+            return
+        self._cursor_timer += dt
+        if self._cursor_timer >= self.cursor_interval:
+            self._cursor_timer = 0.0
+            self._cursor_visible = not self._cursor_visible
+
+    # --- drawing -----------------------------------------------------------
+
+    def _state(self):
+        return (self.view(), self.input_buffer, self._cursor_visible, tuple(self.rect))
+
+    @property
+    def is_dirty(self):
+        return super().is_dirty or self._drawn_state != self._state()
+
+    def get_bounds(self):
+        return self.rect.copy()
+
+    def _line_surface(self, n):
+        """
+        Rendered line number n, from the cache if it was rendered recently.
+        """
+        lines = self._lines
+        surf = lines.get(n)
+        if surf is None:
+            text, color = self._ring[n % self.capacity]
+            # log lines are mostly unique: render them directly instead of
+            # through the shared TextCache, which they'd only churn
+            surf = lines[n] = self._get_font().render(text, True, color or self.text_color, self.bg_color)
+            while len(lines) > 2 * self.rows + 8:
+                lines.popitem(last=False)
+        else:
+            lines.move_to_end(n)
+        return surf
+
+    def _render_viewport(self):
+        """
+        Bring the cached log area up to date with the current view.
+        """
+        rows = self.rows
+        line_h = self.line_height
+        size = (max(0, self.rect.width - 2 * self.padding), rows * line_h)
+        key = (size, line_h, tuple(self.bg_color), tuple(self.text_color))
+        first, end = self.view()
+        if key != self._viewport_key:
+            self._viewport = pygame.Surface(size)
+            self._viewport_key = key
+            self._lines.clear()
+            self._view = None
+        viewport = self._viewport
+        if self._view == (first, end):
+            return viewport
+
+        old = self._view
+        if old is not None and first < old[1] and old[0] < end and abs(first - old[0]) < rows:
+            # overlapping view: move the pixels, render only the new lines
+            viewport.scroll(0, (old[0] - first) * line_h)
+            fresh = [n for n in range(first, end) if not old[0] <= n < old[1]]
+        else:
+            fresh = range(first, end)
+        for n in fresh:
+            y = (n - first) * line_h
+            viewport.fill(self.bg_color, (0, y, size[0], line_h))
+            viewport.blit(self._line_surface(n), (0, y))
+        # below the last line (a view that isn't full yet)
+        y = (end - first) * line_h
+        if y < size[1]:
+            viewport.fill(self.bg_color, (0, y, size[0], size[1] - y))
+        self._view = (first, end)
+        return viewport
+
+    def draw(self, screen):
+        self._drawn_state = self._state()
+        if not self.is_active:
+            return
+        pad = self.padding
+        rect = self.rect
+        viewport = self._render_viewport()
+        # the viewport is opaque: only fill the frame around it
+        vw, vh = viewport.get_size()
+        fill = self.bg_color
+        screen.fill(fill, (rect.x, rect.y, rect.width, pad))
+        screen.fill(fill, (rect.x, rect.y + pad, pad, vh))
+        screen.fill(fill, (rect.x + pad + vw, rect.y + pad, rect.width - pad - vw, vh))
+        screen.fill(fill, (rect.x, rect.y + pad + vh, rect.width, rect.height - pad - vh))
+        screen.blit(viewport, (rect.x + pad, rect.y + pad))
+        if self.prompt is not None:
+            text = self.prompt + self.input_buffer + ("_" if self._cursor_visible else "")
+            label = render_text(self._get_font(), text, self.text_color)
+            screen.blit(label, (rect.x + pad, rect.bottom - pad - self.line_height),
+                        pygame.Rect(0, 0, rect.width - 2 * pad, label.get_height()))
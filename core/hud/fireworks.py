@@ -0,0 +1,195 @@
+"""
+core/hud/fireworks.py
+
+Fireworks: rockets that rise, then burst into sparks that fall and fade.
+
+One Fireworks effect runs any number of simultaneous bursts. Rockets and
+sparks live in preallocated NumPy arrays (structure of arrays, like
+ParticleEmitter): gravity, life decay and culling of dead sparks are one
+vectorized pass, new sparks are written into the freed slots at the end of
+the pool, and drawing is one Surface.blits() call over a pre-rendered atlas
+of spark sprites per (palette color, alpha level).
+"""
+import math
+import pygame
+import numpy as np
+from core.effect import Effect
+from core.sprites import circle_sprites, display_format
+from core.utils import compact_arrays
+
+DEFAULT_PALETTE = [(255,80,80), (255,200,80), (255,255,140), (120,255,120),
+                   (80,220,255), (120,140,255), (220,120,255), (255,255,255)]
+
+class Fireworks(Effect):
+    alpha_buckets = 16  # distinct alpha levels in the sprite atlas
+
+    def __init__(self, ground_y=None, spawn_interval=1.5, sparks_per_burst=50, gravity=150.0,
+                 palette=DEFAULT_PALETTE, spark_size=2, spark_speed=(50, 200), spark_life=(1.0, 2.0),
+                 launch_speed=(200, 300), max_sparks=20000, seed=None):
+        """
+        :param ground_y: rockets start here; defaults to the bottom of the screen
+        :param spawn_interval: seconds between automatic launches (0 = only launch())
+        :param gravity: downward acceleration in pixels/second^2
+        :param palette: burst colors; launch()/burst() add new colors on demand
+        :param spark_size: spark radius in pixels
+        :param spark_speed, spark_life, launch_speed: (min, max) ranges
+        :param max_sparks: spark pool size; sparks beyond it are not spawned
+        :param seed: seed for the RNG, for reproducible runs
+        """
+        super().__init__()
+        self.ground_y = ground_y
+        self.spawn_interval = spawn_interval
+        self.sparks_per_burst = sparks_per_burst
+        self.gravity = gravity
+        self.palette = [tuple(c) for c in palette]
+        self.spark_size = spark_size
+        self.spark_speed = spark_speed
+        self.spark_life = spark_life
+        self.launch_speed = launch_speed
+        self.max_sparks = max_sparks
+
+        # sparks: live ones occupy slots [0, count)
+        self.pos = np.zeros((max_sparks, 2))
+        self.vel = np.zeros((max_sparks, 2))
+        self.life = np.zeros(max_sparks)
+        self.max_life = np.ones(max_sparks)
+        self.color_id = np.zeros(max_sparks, dtype=np.intp)
+        self.count = 0
+
+        # rockets still rising: (x, y, vy, color id) rows
+        self.rockets = np.zeros((0, 4))
+
+        self._rng = np.random.default_rng(seed)
+        self._since_launch = 0.0
+        self._atlas = None
+        self._atlas_key = None
+
+    def reset(self):
+        super().reset()
+        self.count = 0
+        self.rockets = np.zeros((0, 4))
+        self._since_launch = 0.0
+
+    def _color_id(self, color):
+        if color is None:
+            return int(self._rng.integers(len(self.palette)))
+        color = tuple(color)
+        if color not in self.palette:
+            self.palette.append(color)
+        return self.palette.index(color)
+
+    def launch(self, x=None, color=None):
+        """
+        Fire a rocket from the ground; it bursts at the top of its arc.
+
+        :param x: launch position; random if None
+        :param color: burst color; random palette color if None
+        """
+        width, height = self.screen_size()
+        ground = self.ground_y if self.ground_y is not None else height
+        if x is None:
+            x = self._rng.uniform(50, max(51, width - 50))
+        vy = -self._rng.uniform(*self.launch_speed)
+        self.rockets = np.vstack((self.rockets, (x, ground, vy, self._color_id(color))))
+
+    def burst(self, x, y, color=None, count=None):
+        """
+        Explode `count` sparks at (x, y) right away, into the free pool slots.
+        """
+        self._burst(np.array([[x, y]], dtype=float), np.array([self._color_id(color)]),
+                    self.sparks_per_burst if count is None else count)
+
+    def _burst(self, centers, color_ids, per_burst):
+        n = min(len(centers) * per_burst, self.max_sparks - self.count)
+        if n <= 0:
+            return
+        rng = self._rng
+        s = slice(self.count, self.count + n)
+        which = np.repeat(np.arange(len(centers)), per_burst)[:n]
+        angle = rng.uniform(0, 2*math.pi, n)
+        speed = rng.uniform(*self.spark_speed, n)
+        self.pos[s] = centers[which]
+        self.vel[s, 0] = np.cos(angle) * speed
+        self.vel[s, 1] = np.sin(angle) * speed
+        life = rng.uniform(*self.spark_life, n)
+        self.life[s] = life
+        self.max_life[s] = life
+        self.color_id[s] = color_ids[which]
+        self.count += n
+
+    def update(self, dt):
+        super().update(dt)
+        if not self.is_active:
+            return
+
+        if self.spawn_interval > 0:
+            self._since_launch += dt
+            while self._since_launch >= self.spawn_interval:
+                self._since_launch -= self.spawn_interval
+                self.launch()
+
+        # rockets: rise, slow down, burst at the apex
+        rockets = self.rockets
+        if len(rockets):
+            rockets[:, 1] += rockets[:, 2] * dt
+            rockets[:, 2] += self.gravity * dt
+            apex = rockets[:, 2] >= 0
+            if apex.any():
+                self._burst(rockets[apex, :2], rockets[apex, 3].astype(np.intp), self.sparks_per_burst)
+                self.rockets = rockets[~apex]
+
+        # sparks: integrate, age, cull
+        n = self.count
+        if n:
+            vel = self.vel[:n]
+            vel[:, 1] += self.gravity * dt
+            self.pos[:n] += vel * dt
+            self.life[:n] -= dt
+            # survivors move to the front; freed slots are reused by the next burst
+            self.count = compact_arrays((self.pos, self.vel, self.life, self.max_life, self.color_id),
+                                        self.life[:n] > 0)
+
+    def get_bounds(self):
+        points = self.pos[:self.count]
+        if len(self.rockets):
+            points = np.concatenate((points, self.rockets[:, :2]))
+        if not len(points):
+            return pygame.Rect(0, 0, 0, 0)
+        r = max(self.spark_size, 3)
+        left, top = points.min(axis=0) - r
+        right, bottom = points.max(axis=0) + r
+        return pygame.Rect(left, top, right - left + 1, bottom - top + 1)
+
+    def _build_atlas(self):
+        """
+        Sparks: sprite color_id*buckets + bucket; rockets: one full-alpha
+        dot per color after all spark sprites.
+        """
+        atlas = []
+        for color in self.palette:
+            atlas += circle_sprites(color, self.spark_size, self.alpha_buckets)
+        for color in self.palette:
+            surf = pygame.Surface((7, 7), pygame.SRCALPHA)
+            pygame.draw.circle(surf, color[:3], (3, 3), 3)
+            atlas.append(display_format(surf))
+        return atlas
+
+    def draw(self, screen):
+        key = (tuple(self.palette), self.spark_size, self.alpha_buckets)
+        if key != self._atlas_key:
+            self._atlas = self._build_atlas()
+            self._atlas_key = key
+
+        buckets = self.alpha_buckets
+        n = self.count
+        bucket = np.minimum((self.life[:n] / self.max_life[:n] * buckets).astype(np.intp), buckets - 1)
+        index = self.color_id[:n] * buckets + bucket
+        dest = (self.pos[:n] - self.spark_size).astype(np.intp)
+        if len(self.rockets):
+            rocket_index = len(self.palette) * buckets + self.rockets[:, 3].astype(np.intp)
+            index = np.concatenate((index, rocket_index))
+            dest = np.concatenate((dest, (self.rockets[:, :2] - 3).astype(np.intp)))
+        if not len(index):
+            return
+        xs, ys = dest.T.tolist()
+        screen.blits(zip(map(self._atlas.__getitem__, index.tolist()), zip(xs, ys)), doreturn=False)
@@ -0,0 +1,176 @@
+"""
+core/hud/matrix.py
+
+'Matrix rain': columns of glyphs falling down the screen.
+
+Glyphs sit on a fixed character grid; each column has a falling head that
+lights up the cells it passes, and the trail behind it fades out. All
+column state (head position, speed, trail length) and the glyph grid live
+in NumPy arrays, every glyph is pre-rendered once per brightness level into
+an atlas, and a frame is one Surface.blits() call over the lit cells.
+"""
+import pygame
+import numpy as np
+from core.effect import Effect
+from core.fonts import get_font
+from core.sprites import display_format
+from core.utils import gradient
+
+DEFAULT_CHARSET = "".join(chr(c) for c in range(33, 127))
+
+class MatrixRain(Effect):
+    def __init__(self, x=0, y=0, width=None, height=None, columns=None, font_path=None, font_size=20,
+                 color=(0,180,0), head_color=(180,255,180), background=(0,0,0), levels=8,
+                 speed=(80, 180), length=(10, 30), charset=DEFAULT_CHARSET, mutation_rate=0.5, seed=None):
+        """
+        :param width, height: area covered; default to the screen size
+        :param columns: number of columns; default is one per character width
+        :param head_color: color of the leading glyph; the trail fades from
+                           color down to near-black over `levels` levels
+        :param background: color filled behind the rain (glyphs are then
+                           rendered opaque, which blits fastest), or None
+                           to draw transparent glyphs over what's below
+        :param speed: (min, max) fall speed in pixels/second
+        :param length: (min, max) trail length in cells
+        :param mutation_rate: fraction of lit glyphs that change per second
+        :param seed: seed for the RNG, for reproducible runs
+        """
+        super().__init__()
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.columns = columns
+        self.font_path = font_path
+        self.font_size = font_size
+        self.color = color
+        self.head_color = head_color
+        self.background = background
+        self.levels = levels
+        self.speed = speed
+        self.length = length
+        self.charset = charset
+        self.mutation_rate = mutation_rate
+
+        self._rng = np.random.default_rng(seed)
+        self._atlas = None
+        self._atlas_key = None
+        self.cell = (font_size, font_size)
+
+        # per column
+        self.col_x = np.zeros(0, dtype=np.intp)
+        self.head = np.zeros(0)                  # head position in cells (float)
+        self.col_speed = np.zeros(0)             # cells/second
+        self.col_length = np.zeros(0, dtype=np.intp)
+        # glyph index of every cell, shape (rows, columns)
+        self.glyphs = np.zeros((0, 0), dtype=np.intp)
+
+    def reset(self):
+        super().reset()
+        if self.width is None or self.height is None:
+            screen_w, screen_h = self.screen_size()
+            self.width = self.width or screen_w
+            self.height = self.height or screen_h
+        self._build_atlas()
+
+        cell_w, cell_h = self.cell
+        n = self.columns or max(1, self.width // cell_w)
+        rows = max(1, self.height // cell_h)  # whole rows only, glyphs stay inside bounds
+        self.col_x = (np.arange(n) * (self.width / n)).astype(np.intp) + self.x
+        self.glyphs = self._rng.integers(0, len(self.charset), (rows, n))
+        self.head = np.zeros(n)
+        self.col_speed = np.zeros(n)
+        self.col_length = np.zeros(n, dtype=np.intp)
+        self._respawn(np.arange(n), spread=True)
+
+    def _respawn(self, cols, spread=False):
+        """
+        Start new drops in the given columns, above the top edge.
+
+        :param spread: scatter the heads over the whole height (initial fill)
+        """
+        k = len(cols)
+        rng = self._rng
+        rows = self.glyphs.shape[0]
+        self.head[cols] = rng.uniform(-rows, rows if spread else 0, k)
+        self.col_speed[cols] = rng.uniform(self.speed[0], self.speed[1], k) / self.cell[1]
+        self.col_length[cols] = rng.integers(self.length[0], self.length[1] + 1, k)
+
+    def _build_atlas(self):
+        """
+        One sprite per (glyph, level), indexed glyph*levels + level;
+        level 0 is the head, higher levels are dimmer.
+        """
+        key = (self.font_path, self.font_size, tuple(self.color), tuple(self.head_color),
+               None if self.background is None else tuple(self.background), self.levels, self.charset)
+        if key == self._atlas_key:
+            return
+        font = get_font(self.font_path or "Courier", self.font_size, bold=True)
+        levels = self.levels
+        dim = [c // 6 for c in self.color[:3]]
+        tail = gradient([self.color[:3], dim], levels - 1).tolist() if levels > 1 else []
+        colors = [tuple(self.head_color)] + [tuple(c) for c in tail]
+
+        cell_w = max(font.size(ch)[0] for ch in self.charset)
+        cell_h = font.get_linesize()
+        self.cell = (cell_w, cell_h)
+        atlas = []
+        for ch in self.charset:
+            for color in colors:
+                if self.background is None:
+                    atlas.append(display_format(font.render(ch, True, color)))
+                else:
+                    atlas.append(display_format(font.render(ch, True, color, self.background), alpha=False))
+        self._atlas = atlas
+        self._atlas_key = key
+
+    def update(self, dt):
+        super().update(dt)
+        if not len(self.head):
+            return
+        self.head += self.col_speed * dt
+        rows = self.glyphs.shape[0]
+        done = np.flatnonzero(self.head - self.col_length > rows)
+        if len(done):
+            self._respawn(done)
+
+        # a few random glyphs change every frame
+        if self.mutation_rate > 0:
+            cells = self.glyphs.size
+            k = self._rng.binomial(cells, min(1.0, self.mutation_rate * dt))
+            if k:
+                flat = self.glyphs.reshape(-1)
+                flat[self._rng.integers(0, cells, k)] = self._rng.integers(0, len(self.charset), k)
+
+    def get_bounds(self):
+        return pygame.Rect(self.x, self.y, self.width or 0, self.height or 0)
+
+    def lit_cells(self):
+        """
+        :return: (column index, row, level) arrays of every visible glyph
+        """
+        rows = self.glyphs.shape[0]
+        head_row = np.floor(self.head).astype(np.intp)
+        length = self.col_length
+        behind = np.arange(int(length.max()) if len(length) else 0)
+        row = head_row[:, None] - behind[None, :]
+        lit = (behind[None, :] < length[:, None]) & (row >= 0) & (row < rows)
+        col, k = np.nonzero(lit)
+        row = row[col, k]
+        # head is level 0, the rest of the trail fades over levels 1..levels-1
+        level = np.where(k == 0, 0, 1 + (k * (self.levels - 1)) // np.maximum(length[col], 1))
+        return col, row, np.minimum(level, self.levels - 1)
+
+    def draw(self, screen):
+        self._build_atlas()
+        if self.background is not None:
+            screen.fill(self.background, self.get_bounds())
+        if not len(self.head):
+            return
+        col, row, level = self.lit_cells()
+        if not len(col):
+            return
+        index = self.glyphs[row, col] * self.levels + level
+        xs = self.col_x[col].tolist()
+        ys = (row * self.cell[1] + self.y).tolist()
+        screen.blits(zip(map(self._atlas.__getitem__, index.tolist()), zip(xs, ys)), doreturn=False)
@@ -2,59 +2,131 @@
 core/hud/panel.py
 
 Glowing or translucent panels that can slide in/out.
+
+The panel body (translucent fill + glow border) is rendered once into a
+cached surface and only rebuilt when its size or colors change; sliding is
+done by a tween on x/y, started when the panel becomes active (after its
+start_delay) and cancelled when it is killed or reset.
 """
 import pygame
 from core.effect import Effect
+from core.tween import Tweener
+from core.utils import ease_out
+
+class Panel(Effect):
+    static = True  # moves are picked up through get_bounds()
 
-class SlidingPanel(Effect):
-    def __init__(self, x, y, width, height, color=(20,20,20), glow_color=(0,200,200), direction='up', speed=200):
+    def __init__(self, x, y, width, height, color=(20,20,20), glow_color=(0,200,200), alpha=180, border=2):
         """
-        :param direction: up/down/left/right from which the panel slides in
+        :param alpha: opacity of the panel fill (0..255)
+        :param border: glow border width in pixels
         """
         super().__init__()
         self.x = x
         self.y = y
-        self.final_x = x
-        self.final_y = y
         self.width = width
         self.height = height
         self.color = color
         self.glow_color = glow_color
+        self.alpha = alpha
+        self.border = border
+        self._body = None
+        self._body_key = None
+
+    def _current_body_key(self):
+        return (self.width, self.height, tuple(self.color), tuple(self.glow_color), self.alpha, self.border)
+
+    @property
+    def is_dirty(self):
+        return super().is_dirty or self._body_key != self._current_body_key()
+
+    def get_bounds(self):
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    def body(self):
+        """
+        The cached panel surface, rebuilt only when size/colors changed.
+        """
+        key = self._current_body_key()
+        if key != self._body_key:
+            self._body = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            # Draw background
+            self._body.fill((*self.color, self.alpha))  # semi-translucent
+            # Glow border
+            pygame.draw.rect(self._body, self.glow_color, (0,0,self.width,self.height), self.border)
+            if pygame.display.get_surface():
+                self._body = self._body.convert_alpha()
+            self._body_key = key
+        return self._body
+
+    def draw(self, screen):
+        screen.blit(self.body(), (self.x, self.y))
+
+
+class SlidingPanel(Panel):
+    def __init__(self, x, y, width, height, color=(20,20,20), glow_color=(0,200,200), direction='up', speed=200,
+                 easing=ease_out):
+        """
+        :param direction: up/down/left/right from which the panel slides in
+        :param speed: average slide speed in pixels/second
+        :param easing: easing function from core.utils shaping the slide
+        """
+        super().__init__(x, y, width, height, color, glow_color)
+        self.final_x = x
+        self.final_y = y
         self.direction = direction
         self.speed = speed
+        self.easing = easing
+        self._visible = False
+        self._tweener = None  # private Tweener when not owned by a Scene
+        self._slide = None    # running x/y tweens, started on activation
+
+    def reset(self):
+        super().reset()
+        self._cancel_slide()
         self._visible = False
+        self.x, self.y = self.final_x, self.final_y
 
-        # Start position off-screen
-        if direction == 'up':
-            self.y = pygame.display.get_surface().get_height()
-        elif direction == 'down':
-            self.y = -height
-        elif direction == 'left':
-            self.x = -width
-        elif direction == 'right':
-            self.x = pygame.display.get_surface().get_width()
+        # Start position off-screen; the slide starts once the panel is active
+        screen_w, screen_h = self.screen_size()
+        if self.direction == 'up':
+            self.y = screen_h
+        elif self.direction == 'down':
+            self.y = -self.height
+        elif self.direction == 'left':
+            self.x = -self.width
+        elif self.direction == 'right':
+            self.x = screen_w
 
-    def update(self, dt):
-        if not self._visible:
-            # Slide into final position
-            dx = self.final_x - self.x
-            dy = self.final_y - self.y
-            dist = (dx**2 + dy**2)**0.5
-            if dist > 5:
-                angle = pygame.math.atan2(dy, dx)
-                self.x += self.speed * dt * pygame.math.cos(angle)
-                self.y += self.speed * dt * pygame.math.sin(angle)
-            else:
-                self.x, self.y = self.final_x, self.final_y
-                self._visible = True
+    def _start_slide(self):
+        """
+        Slide into final position.
+        """
+        if self.scene is not None:
+            tweens = self.scene.tweens
+        else:
+            tweens = self._tweener = Tweener()
+        dist = ((self.final_x - self.x)**2 + (self.final_y - self.y)**2)**0.5
+        duration = dist / self.speed if self.speed > 0 else 0.0
+        self._slide = [tweens.tween(self, 'x', self.final_x, duration, self.easing),
+                       tweens.tween(self, 'y', self.final_y, duration, self.easing, on_complete=self._arrived)]
 
-    def draw(self, screen):
-        rect = pygame.Rect(self.x, self.y, self.width, self.height)
-        # Draw background
-        panel_surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        panel_surf.fill((*self.color, 180))  # semi-translucent
+    def _cancel_slide(self):
+        for tween in self._slide or ():
+            tween.cancel()
+        self._slide = None
+        self._tweener = None
+
+    def _arrived(self, tween):
+        self._visible = True
 
-        # Glow border
-        pygame.draw.rect(panel_surf, self.glow_color, (0,0,self.width,self.height), 2)
+    def update(self, dt):
+        super().update(dt)
+        if self._slide is None and self.is_active and not self._should_remove:
+            self._start_slide()
+        if self._tweener is not None:
+            self._tweener.update(dt)
 
-        screen.blit(panel_surf, rect)
+    def kill(self):
+        self._cancel_slide()
+        super().kill()
@@ -2,47 +2,113 @@
 core/hud/particles.py
 
 Simple particle system for floating shapes or sparkles.
+
+Particles live in preallocated NumPy arrays (structure of arrays): spawning
+fills a batch of slots at the end, dead particles are compacted away in
+place, and drawing is one Surface.blits() call over a pre-rendered atlas of
+circle sprites bucketed by size and alpha.
 """
 import pygame
-import random
-import math
+import numpy as np
 from core.effect import Effect
+from core.sprites import circle_sprites
+from core.utils import compact_arrays
 
 class ParticleEmitter(Effect):
-    def __init__(self, x, y, max_particles=100, spawn_rate=5, color=(255,255,255)):
+    alpha_buckets = 16  # distinct alpha levels in the sprite atlas
+    max_life = 3.0      # alpha is life / max_life
+
+    def __init__(self, x, y, max_particles=100, spawn_rate=5, color=(255,255,255),
+                 min_size=2, max_size=5, seed=None):
+        """
+        :param spawn_rate: particles spawned per update
+        :param min_size, max_size: particle radius range in pixels (inclusive)
+        :param seed: seed for the particle RNG, for reproducible runs
+        """
         super().__init__()
         self.x = x
         self.y = y
         self.max_particles = max_particles
         self.spawn_rate = spawn_rate
         self.color = color
-        self.particles = []
+        self.min_size = min_size
+        self.max_size = max_size
+
+        self.pos = np.zeros((max_particles, 2))
+        self.vel = np.zeros((max_particles, 2))
+        self.life = np.zeros(max_particles)
+        self.size = np.zeros(max_particles, dtype=np.intp)
+        self.count = 0  # live particles occupy slots [0, count)
+
+        self._rng = np.random.default_rng(seed)
+        self._atlas = None
+        self._atlas_key = None
+
+    def reset(self):
+        super().reset()
+        self.count = 0
+
+    def spawn(self, n):
+        """
+        Spawn up to n particles at the emitter position in one batch.
+        """
+        n = min(n, self.max_particles - self.count)
+        if n <= 0:
+            return
+        s = slice(self.count, self.count + n)
+        rng = self._rng
+        self.pos[s] = (self.x, self.y)
+        # random velocity
+        self.vel[s, 0] = rng.uniform(-30, 30, n)
+        self.vel[s, 1] = rng.uniform(-50, -20, n)
+        self.life[s] = rng.uniform(1, self.max_life, n)
+        self.size[s] = rng.integers(self.min_size, self.max_size + 1, n)
+        self.count += n
 
     def update(self, dt):
+        super().update(dt)
         # Spawn new particles
-        for _ in range(self.spawn_rate):
-            if len(self.particles) < self.max_particles:
-                # random velocity
-                vx = random.uniform(-30, 30)
-                vy = random.uniform(-50, -20)
-                life = random.uniform(1, 3)
-                size = random.randint(2, 5)
-                self.particles.append([self.x, self.y, vx, vy, life, size])
+        self.spawn(self.spawn_rate)
 
         # Update existing
-        for p in self.particles:
-            p[0] += p[2]*dt
-            p[1] += p[3]*dt
-            p[4] -= dt  # life
-        # Remove dead
-        self.particles = [p for p in self.particles if p[4] > 0]
+        n = self.count
+        self.pos[:n] += self.vel[:n] * dt
+        self.life[:n] -= dt
+
+        # Remove dead: compact survivors to the front of the arrays
+        self.count = compact_arrays((self.pos, self.vel, self.life, self.size), self.life[:n] > 0)
+
+    def get_bounds(self):
+        n = self.count
+        if not n:
+            return pygame.Rect(self.x, self.y, 0, 0)
+        left, top = self.pos[:n].min(axis=0) - self.max_size
+        right, bottom = self.pos[:n].max(axis=0) + self.max_size
+        return pygame.Rect(left, top, right - left + 1, bottom - top + 1)
+
+    def _build_atlas(self):
+        """
+        One sprite per (size, alpha bucket), indexed size_index*buckets + bucket.
+        """
+        atlas = []
+        for size in range(self.min_size, self.max_size + 1):
+            atlas += circle_sprites(self.color, size, self.alpha_buckets)
+        return atlas
 
     def draw(self, screen):
-        for p in self.particles:
-            x, y, vx, vy, life, size = p
-            alpha = int(255 * (life/3))
-            col = (*self.color[:3], alpha)
-            # quick approach: draw a small rect or circle
-            surf = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-            pygame.draw.circle(surf, col, (size, size), size)
-            screen.blit(surf, (x-size, y-size))
+        key = (tuple(self.color), self.min_size, self.max_size, self.alpha_buckets)
+        if key != self._atlas_key:
+            self._atlas = self._build_atlas()
+            self._atlas_key = key
+
+        n = self.count
+        if not n:
+            return
+        buckets = self.alpha_buckets
+        size = self.size[:n]
+        bucket = np.minimum((self.life[:n] * (buckets / self.max_life)).astype(np.intp), buckets - 1)
+        index = (size - self.min_size) * buckets + bucket
+        dest = (self.pos[:n] - size[:, None]).astype(np.intp)
+
+        xs, ys = dest.T.tolist()
+        screen.blits(zip(map(self._atlas.__getitem__, index.tolist()), zip(xs, ys)), doreturn=False)
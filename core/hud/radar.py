@@ -2,14 +2,45 @@
 core/hud/radar.py
 
 A rotating radar sweep effect.
+
+The static body (outer ring + radial lines) is rendered once per
+(radius, color) into a shared colorkeyed sprite. The translucent sweep
+trail is a wedge sprite rendered with NumPy for each of `angle_steps`
+quantized angles, cropped to the wedge and cached on first use. Blips
+(contacts) live in NumPy arrays: each lights up when the sweep passes over
+it and fades out over `afterglow` seconds; drawing is one Surface.blits()
+call over pre-rendered dots, one per brightness level.
 """
 import math
-import random
 import pygame
+import numpy as np
 from core.effect import Effect
+from core.sprites import display_format
+
+TWO_PI = 2 * math.pi
 
 class RadarSweep(Effect):
-    def __init__(self, x, y, radius=100, sweep_speed=1.0, color=(0,255,0)):
+    glow_levels = 16  # distinct blip brightness levels
+    blip_radius = 3
+
+    # shared between instances: (radius, color) -> body sprite,
+    # (radius, color, trail, alpha, steps) -> {angle step: (sprite, offset)}
+    # and radius -> (angle, inside circle) of every pixel around the center
+    _bodies = {}
+    _wedges = {}
+    _polar = {}
+
+    def __init__(self, x, y, radius=100, sweep_speed=1.0, color=(0,255,0), blip_count=8,
+                 afterglow=2.0, trail=math.pi/3, trail_alpha=90, angle_steps=120, seed=None):
+        """
+        :param sweep_speed: radians/sec
+        :param blip_count: number of random contacts to start with
+        :param afterglow: seconds a blip takes to fade after the sweep passes
+        :param trail: angular length of the translucent trail in radians (0 = none)
+        :param trail_alpha: opacity of the trail right behind the sweep line
+        :param angle_steps: rotated trail sprites per revolution
+        :param seed: seed for the random blips
+        """
         super().__init__()
         self.x = x
         self.y = y
@@ -17,33 +48,207 @@ class RadarSweep(Effect):
         self.angle = 0.0
         self.sweep_speed = sweep_speed  # radians/sec
         self.color = color
+        self.afterglow = afterglow
+        self.trail = trail
+        self.trail_alpha = trail_alpha
+        self.angle_steps = angle_steps
+
+        self._rng = np.random.default_rng(seed)
+        self.blip_angle = np.zeros(0)
+        self.blip_dist = np.zeros(0)
+        self.blip_lit = np.zeros(0)   # scene time the sweep last passed each blip
+        self._lit_until = -np.inf     # no blip glows after this scene time
+        self._blip_xy = None          # cached dot positions on screen
+        self._blip_xy_key = None
+        self._dots = None
+        self._dots_key = None
         # random "blips"
-        self.blips = [(random.uniform(0, 2*math.pi), random.uniform(0, radius)) for _ in range(8)]
+        self.add_blips(self._rng.uniform(0, TWO_PI, blip_count),
+                       self._rng.uniform(0, radius, blip_count))
+
+    @property
+    def blips(self):
+        """
+        Contacts as a list of (angle, distance) tuples.
+        """
+        return list(zip(self.blip_angle.tolist(), self.blip_dist.tolist()))
+
+    @blips.setter
+    def blips(self, blips):
+        self.clear_blips()
+        if blips:
+            angles, dists = zip(*blips)
+            self.add_blips(angles, dists)
+
+    def add_blips(self, angles, distances):
+        """
+        Add contacts in one batch.
+
+        :param angles: radians, same convention as the sweep angle
+        :param distances: pixels from the center
+        """
+        angles = np.mod(np.asarray(angles, dtype=float), TWO_PI)
+        self.blip_angle = np.concatenate((self.blip_angle, angles))
+        self.blip_dist = np.concatenate((self.blip_dist, np.asarray(distances, dtype=float)))
+        self.blip_lit = np.concatenate((self.blip_lit, np.full(len(angles), -np.inf)))
+        self._blip_xy = None
+
+    def clear_blips(self):
+        self.blip_angle = np.zeros(0)
+        self.blip_dist = np.zeros(0)
+        self.blip_lit = np.zeros(0)
+        self._blip_xy = None
+
+    def reset(self):
+        super().reset()
+        self.blip_lit[:] = -np.inf
+        self._lit_until = -np.inf
 
     def update(self, dt):
-        self.angle += self.sweep_speed * dt
-        self.angle %= 2*math.pi
+        super().update(dt)
+        prev = self.angle
+        swept = self.sweep_speed * dt
+        self.angle += swept
+        self.angle %= TWO_PI
+
+        # light every blip the sweep line passed this frame
+        if len(self.blip_angle) and swept > 0:
+            now = self.now()
+            if swept >= TWO_PI:
+                self.blip_lit[:] = now
+            else:
+                passed = np.mod(self.blip_angle - prev, TWO_PI) <= swept
+                if not passed.any():
+                    return
+                self.blip_lit[passed] = now
+            self._lit_until = now + max(self.afterglow, 0.0)
+
+    def get_bounds(self):
+        # +3 for blips drawn right on the rim
+        r = self.radius + 3
+        return pygame.Rect(self.x - r, self.y - r, r*2 + 1, r*2 + 1)
+
+    def _body(self):
+        """
+        Outer ring and radial lines, shared by all radars of this radius/color.
+        """
+        key = (self.radius, tuple(self.color))
+        body = self._bodies.get(key)
+        if body is None:
+            r = self.radius
+            colorkey = (0, 0, 0) if tuple(self.color[:3]) != (0, 0, 0) else (255, 0, 255)
+            body = pygame.Surface((r*2 + 1, r*2 + 1))
+            body.fill(colorkey)
+            pygame.draw.circle(body, self.color, (r, r), r, 1)
+            angles = np.radians(np.arange(0, 360, 45))
+            ends = np.stack((r + np.cos(angles) * r, r + np.sin(angles) * r), axis=-1)
+            for end in ends.tolist():
+                pygame.draw.line(body, self.color, (r, r), end, 1)
+            body.set_colorkey(colorkey, pygame.RLEACCEL)
+            self._bodies[key] = body
+        return body
+
+    def _wedge(self, step):
+        """
+        Trail sprite for the given angle step and its offset from the center.
+        """
+        key = (self.radius, tuple(self.color), self.trail, self.trail_alpha, self.angle_steps)
+        wedges = self._wedges.get(key)
+        if wedges is None:
+            wedges = self._wedges[key] = {}
+        wedge = wedges.get(step)
+        if wedge is None:
+            wedge = wedges[step] = self._render_wedge(step * TWO_PI / self.angle_steps)
+        return wedge
+
+    def _render_wedge(self, angle):
+        r = self.radius
+        polar = self._polar.get(r)
+        if polar is None:
+            yy, xx = np.mgrid[-r:r + 1, -r:r + 1].astype(float)
+            polar = self._polar[r] = (np.arctan2(yy, xx), xx*xx + yy*yy <= r*r)
+        theta, disc = polar
+
+        # only look at the box around the wedge: the center, both edges and
+        # any axis the arc crosses
+        trail = min(self.trail, TWO_PI)
+        edges = [angle - trail, angle]
+        edges += [q * math.pi / 2 for q in range(math.floor(edges[0] / (math.pi / 2)) + 1,
+                                                 math.floor(angle / (math.pi / 2)) + 1)]
+        xs = [0.0] + [math.cos(a) * r for a in edges]
+        ys = [0.0] + [math.sin(a) * r for a in edges]
+        left, right = max(math.floor(min(xs)), -r), min(math.ceil(max(xs)), r)
+        top, bottom = max(math.floor(min(ys)), -r), min(math.ceil(max(ys)), r)
+        box = (slice(top + r, bottom + r + 1), slice(left + r, right + r + 1))
+
+        behind = np.mod(angle - theta[box], TWO_PI)
+        alpha = np.where(disc[box] & (behind <= trail), self.trail_alpha * (1.0 - behind / trail), 0.0)
+        if not alpha.any():
+            return None
+        h, w = alpha.shape
+        sprite = pygame.Surface((w, h), pygame.SRCALPHA)
+        sprite.fill((*self.color[:3], 0))
+        pixels = pygame.surfarray.pixels_alpha(sprite)
+        pixels[...] = alpha.T.astype(np.uint8)
+        del pixels
+        return sprite, (left, top)
+
+    def _dot_sprites(self):
+        key = (tuple(self.color), self.blip_radius, self.glow_levels)
+        if key != self._dots_key:
+            size = self.blip_radius
+            levels = self.glow_levels
+            self._dots = []
+            for level in range(levels):
+                surf = pygame.Surface((size*2 + 1, size*2 + 1), pygame.SRCALPHA)
+                pygame.draw.circle(surf, (*self.color[:3], int(255 * (level + 1) / levels)), (size, size), size)
+                self._dots.append(display_format(surf))
+            self._dots_key = key
+        return self._dots
+
+    def _draw_blips(self, screen):
+        now = self.now()
+        if not len(self.blip_angle) or now > self._lit_until:
+            return
+        levels = self.glow_levels
+        if self.afterglow > 0:
+            # glow level: `levels` right when lit, down to 0 after afterglow
+            glow = (self.blip_lit - now) * (levels / self.afterglow) + levels
+        else:
+            # no afterglow: blips show only on the frame the sweep passes
+            glow = np.where(self.blip_lit >= now, float(levels), 0.0)
+        visible = np.flatnonzero(glow > 0)
+        if not len(visible):
+            return
+
+        key = (self.x, self.y, self.blip_radius)
+        if key != self._blip_xy_key or self._blip_xy is None:
+            xy = np.stack((np.cos(self.blip_angle), np.sin(self.blip_angle)), axis=-1) * self.blip_dist[:, None]
+            xy += (self.x - self.blip_radius, self.y - self.blip_radius)
+            self._blip_xy = xy.astype(np.intp)
+            self._blip_xy_key = key
+        level = np.minimum(glow[visible], levels - 1).astype(np.intp)
+        xs, ys = self._blip_xy[visible].T.tolist()
+        dots = self._dot_sprites()
+        screen.blits(zip(map(dots.__getitem__, level.tolist()), zip(xs, ys)), doreturn=False)
 
     def draw(self, screen):
-        # Draw the outer circle
-        pygame.draw.circle(screen, self.color, (self.x, self.y), self.radius, 1)
-        # Draw some radial lines
-        for r in range(0, 360, 45):
-            rad = math.radians(r)
-            end_x = self.x + math.cos(rad)*self.radius
-            end_y = self.y + math.sin(rad)*self.radius
-            pygame.draw.line(screen, self.color, (self.x, self.y), (end_x, end_y), 1)
-
-        # Draw blips
-        for b_angle, b_dist in self.blips:
-            bx = self.x + math.cos(b_angle) * b_dist
-            by = self.y + math.sin(b_angle) * b_dist
-            pygame.draw.circle(screen, self.color, (int(bx), int(by)), 3)
+        r = self.radius
+        # Outer circle and radial lines
+        screen.blit(self._body(), (self.x - r, self.y - r))
+
+        # Translucent trail behind the sweep line
+        if self.trail > 0 and self.trail_alpha > 0:
+            step = int(round(self.angle / TWO_PI * self.angle_steps)) % self.angle_steps
+            wedge = self._wedge(step)
+            if wedge is not None:
+                sprite, (dx, dy) = wedge
+                screen.blit(sprite, (self.x + dx, self.y + dy))
+
+        # Blips, fading since the sweep last passed them
+        self._draw_blips(screen)
 
         # Draw the sweep line
         end_x = self.x + math.cos(self.angle)*self.radius
         end_y = self.y + math.sin(self.angle)*self.radius
         pygame.draw.line(screen, self.color, (self.x, self.y), (end_x, end_y), 2)
-
-        # Possibly draw a translucent sector behind the sweep line for a more
-        # advanced scanning effect.
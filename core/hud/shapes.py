@@ -4,30 +4,74 @@ core/hud/shapes.py
 Drawing futuristic vector shapes, grids, crosshairs, etc.
 """
 import pygame
-import math
+import numpy as np
 from core.effect import Effect
 
 class HexGrid(Effect):
     """
     Example effect: draws a hexagonal grid as a background or overlay.
+
+    The grid is rasterized once into a colorkeyed layer (per screen size,
+    color and cell size) and each frame costs a single blit.
     """
+    static = True  # the grid never changes by itself
+    event_types = (pygame.VIDEORESIZE,)
+
     def __init__(self, color=(100,100,100), cell_size=30):
         super().__init__()
         self.color = color
         self.cell_size = cell_size
+        self._screen_size = None
+        self._layer = None
+        self._layer_key = None
+
+    def get_bounds(self):
+        # covers the whole screen; unknown until the first draw
+        if self._screen_size is None:
+            return None
+        return pygame.Rect((0, 0), self._screen_size)
+
+    def handle_event(self, event):
+        if event.type == pygame.VIDEORESIZE:
+            # drop the old layer now, it is rebuilt at the new size on draw
+            self._layer = None
+            self._layer_key = None
+            self.mark_dirty()
+
+    def hex_vertices(self, width, height):
+        """
+        Vertices of every cell covering a width x height area.
+
+        :return: float array of shape (cells, 6, 2)
+        """
+        cell = self.cell_size
+        ys = np.arange(0, height, cell, dtype=float)
+        xs = np.arange(0, width, int(cell*1.5), dtype=float)
+        cx, cy = np.meshgrid(xs, ys)
+        # offset every other row
+        cx[1::2] += cell*0.75
+        centers = np.stack((cx, cy), axis=-1).reshape(-1, 1, 2)
+
+        angles = np.radians(np.arange(0, 360, 60))
+        corners = np.stack((np.cos(angles), np.sin(angles)), axis=-1) * (cell*0.5)
+        return centers + corners
+
+    def _build_layer(self, size):
+        # Lines are not antialiased, so a colorkeyed layer is exact, and RLE
+        # encoding makes blitting the mostly-empty grid nearly free.
+        key = (0, 0, 0) if tuple(self.color[:3]) != (0, 0, 0) else (255, 0, 255)
+        layer = pygame.Surface(size)
+        layer.fill(key)
+        for points in self.hex_vertices(*size).tolist():
+            pygame.draw.polygon(layer, self.color, points, 1)
+        layer.set_colorkey(key, pygame.RLEACCEL)
+        return layer
 
     def draw(self, screen):
-        width, height = screen.get_size()
-        for y in range(0, height, self.cell_size):
-            for x in range(0, width, int(self.cell_size*1.5)):
-                # offset every other row
-                offset = 0 if ((y//self.cell_size) % 2 == 0) else self.cell_size*0.75
-                cx = x + offset
-                cy = y
-                points = []
-                for angle_deg in range(0, 360, 60):
-                    angle_rad = math.radians(angle_deg)
-                    px = cx + math.cos(angle_rad)*self.cell_size*0.5
-                    py = cy + math.sin(angle_rad)*self.cell_size*0.5
-                    points.append((px, py))
-                pygame.draw.polygon(screen, self.color, points, 1)
+        size = screen.get_size()
+        self._screen_size = size
+        key = (size, tuple(self.color), self.cell_size)
+        if key != self._layer_key:
+            self._layer = self._build_layer(size)
+            self._layer_key = key
+        screen.blit(self._layer, (0, 0))
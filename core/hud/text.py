@@ -2,23 +2,99 @@
 core/hud/text.py
 
 Text blocks or data blocks with futuristic fonts, highlight logic, etc.
+ - TextBlock: a line of text, repainted only when it changes
+ - DataBlock: a caption and a formatted live value ("CPU   42.0 %"); bind
+   it to an Observable (core/binding.py) with source=
 """
-import pygame
 from core.effect import Effect
+from core.fonts import get_font, render_text
 
 class TextBlock(Effect):
+    static = True  # only repainted when text/color change
+
     def __init__(self, text, x, y, font_path=None, font_size=24, color=(255,255,255)):
         super().__init__()
         self.text = text
         self.x = x
         self.y = y
         self.color = color
-        # Load custom font if provided
-        if font_path:
-            self.font = pygame.font.Font(font_path, font_size)
+        # Custom font if provided; fonts are loaded once and shared
+        self.font = get_font(font_path or "Arial", font_size)
+        self._drawn_state = None
+
+    @property
+    def is_dirty(self):
+        return super().is_dirty or self._drawn_state != (self.text, self.color)
+
+    def get_bounds(self):
+        return render_text(self.font, self.text, self.color).get_rect(topleft=(self.x, self.y))
+
+    def draw(self, screen):
+        self._drawn_state = (self.text, self.color)
+        screen.blit(render_text(self.font, self.text, self.color), (self.x, self.y))
+
+
+class DataBlock(Effect):
+    static = True  # only repainted when the formatted value/colors change
+
+    def __init__(self, label, x, y, value=None, fmt="{}", width=None, font_path=None, font_size=24,
+                 label_color=(150,150,150), value_color=(0,255,255), placeholder="--", source=None):
+        """
+        :param label: caption drawn at (x, y)
+        :param fmt: format string or callable turning the value into text
+        :param width: the value is right-aligned at x + width; None puts it
+                      right after the label
+        :param placeholder: text shown while value is None
+        :param source: an Observable to follow (see core/binding.py)
+        """
+        super().__init__()
+        self.label = label
+        self.x = x
+        self.y = y
+        self.value = value
+        self.fmt = fmt
+        self.width = width
+        self.label_color = label_color
+        self.value_color = value_color
+        self.placeholder = placeholder
+        self.font = get_font(font_path or "Arial", font_size)
+        self._drawn_state = None
+        self.binding = source.bind(self) if source is not None else None
+
+    @property
+    def text(self):
+        """
+        The value as displayed.
+        """
+        if self.value is None:
+            return self.placeholder
+        if callable(self.fmt):
+            return self.fmt(self.value)
+        return self.fmt.format(self.value)
+
+    def _state(self):
+        return (self.label, self.text, self.label_color, self.value_color, self.x, self.y, self.width)
+
+    @property
+    def is_dirty(self):
+        return super().is_dirty or self._drawn_state != self._state()
+
+    def _layout(self):
+        caption = render_text(self.font, self.label, self.label_color)
+        value = render_text(self.font, self.text, self.value_color)
+        if self.width is None:
+            value_x = self.x + caption.get_width() + self.font.size(" ")[0]
         else:
-            self.font = pygame.font.SysFont("Arial", font_size, bold=False)
+            value_x = self.x + self.width - value.get_width()
+        return caption, value, value_x
+
+    def get_bounds(self):
+        caption, value, value_x = self._layout()
+        rect = caption.get_rect(topleft=(self.x, self.y))
+        return rect.union(value.get_rect(topleft=(value_x, self.y)))
 
     def draw(self, screen):
-        text_surf = self.font.render(self.text, True, self.color)
-        screen.blit(text_surf, (self.x, self.y))
+        self._drawn_state = self._state()
+        caption, value, value_x = self._layout()
+        screen.blit(caption, (self.x, self.y))
+        screen.blit(value, (value_x, self.y))
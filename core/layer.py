@@ -0,0 +1,85 @@
+"""
+core/layer.py
+
+Layer: a named slice of a Scene's draw order.
+ - effects pick a layer by name through Effect.layer (None = default layer)
+ - a cached layer renders its effects into its own screen-sized surface and
+   only re-renders when one of them is dirty, moves, appears or disappears;
+   otherwise it costs a single blit per frame
+ - the default layer (name None) is live: its effects draw straight to the
+   screen every frame
+ - the bottom layer, if cached, also holds the Scene background and is
+   blitted opaque
+
+Layers are composited back to front in Scene.layers order; within a layer
+effects keep their z_order.
+"""
+
+import pygame
+
+class Layer:
+    # frames a cached layer must stay unchanged before it is RLE-encoded
+    rle_after = 2
+
+    def __init__(self, name, cached=True):
+        """
+        :param name: name effects refer to via Effect.layer
+        :param cached: render into an offscreen surface (False: draw live)
+        """
+        self.name = name
+        self.cached = cached
+        self.renders = 0    # times the cached surface was re-rendered
+        self.surface = None
+        self._state = None
+        self._stable = 0
+        self._valid = False
+
+    def invalidate(self):
+        """
+        Force a re-render on the next frame.
+        """
+        self._valid = False
+
+    def _snapshot(self, effects, opaque, background):
+        return (opaque, background, [(e, e.get_bounds()) for e in effects])
+
+    def render(self, scene, effects, size, draw, opaque=False):
+        """
+        Bring the cached surface up to date and return it.
+
+        :param effects: the layer's active effects, in z_order
+        :param draw: draw(effect, surface) callable
+        :param opaque: fill with the Scene background instead of transparency
+        """
+        state = self._snapshot(effects, opaque, scene.background if opaque else None)
+        surf = self.surface
+        if (self._valid and surf is not None and surf.get_size() == size and state == self._state
+                and not any(e.is_dirty for e in effects)):
+            self._stable += 1
+            if self._stable == self.rle_after and not opaque:
+                # unchanged for a while: RLE makes the per-frame blit skip
+                # the transparent parts (encoded once, on the next blit)
+                surf.set_alpha(255, pygame.RLEACCEL)
+            return surf
+
+        if surf is None or surf.get_size() != size or self._stable >= self.rle_after \
+                or self._state is None or self._state[0] != opaque:
+            surf = pygame.Surface(size) if opaque else pygame.Surface(size, pygame.SRCALPHA)
+            if pygame.display.get_surface():
+                surf = surf.convert() if opaque else surf.convert_alpha()
+            self.surface = surf
+        if opaque:
+            scene._fill_background(surf)
+        else:
+            surf.fill((0, 0, 0, 0))
+        for e in effects:
+            draw(e, surf)
+            e.clear_dirty()
+        self._state = state
+        self._stable = 0
+        self._valid = True
+        self.renders += 1
+        return surf
+
+    def __repr__(self):
+        return "Layer(%r, cached=%r)" % (self.name, self.cached)
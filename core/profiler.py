@@ -0,0 +1,272 @@
+"""
+core/profiler.py
+
+Frame profiler: per-effect timing of event handling, update and draw.
+ - times are taken with time.perf_counter_ns()
+ - a rolling window of the last N frames feeds averages/maxima
+ - toggled at runtime (Engine: F3); when disabled the Scene and Engine skip
+   the timed code paths entirely, so the cost is one attribute check per frame
+ - ProfilerOverlay draws the top-N most expensive effects on screen
+ - export_chrome_trace() writes a Chrome trace / Perfetto JSON file
+   (open it in chrome://tracing or https://ui.perfetto.dev)
+"""
+
+import itertools
+import json
+import os
+import weakref
+from collections import deque
+from time import perf_counter_ns
+
+import pygame
+
+from core.effect import Effect
+from core.fonts import get_font
+
+class Profiler:
+    def __init__(self, window=120, enabled=False, max_trace_events=200000):
+        """
+        :param window: number of frames averaged in stats()/top()
+        :param enabled: start recording right away
+        :param max_trace_events: spans kept for export_chrome_trace(); the
+                                 oldest are dropped first
+        """
+        self.enabled = enabled
+        self.window = window
+        self.frames = 0          # frames recorded since the last clear()
+        self._frame = {}         # (label, phase) -> ns spent this frame
+        self._history = deque()  # per-frame dicts, newest last
+        self._totals = {}        # (label, phase) -> ns summed over _history
+        self._frame_times = deque()
+        self._frame_start = None
+        self._trace = deque(maxlen=max_trace_events)
+        self._labels = weakref.WeakKeyDictionary()
+        self._label_ids = itertools.count(1)
+        self._epoch = perf_counter_ns()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        self._frame_start = None
+
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+        return self.enabled
+
+    def clear(self):
+        """
+        Forget every recorded frame and trace span.
+        """
+        self.frames = 0
+        self._frame.clear()
+        self._history.clear()
+        self._totals.clear()
+        self._frame_times.clear()
+        self._frame_start = None
+        self._trace.clear()
+
+    def label(self, effect):
+        """
+        Name shown for an effect: class name plus a short id, e.g. "RadarSweep#3".
+        """
+        try:
+            return self._labels[effect]
+        except (KeyError, TypeError):
+            pass
+        name = "%s#%d" % (type(effect).__name__, next(self._label_ids))
+        try:
+            self._labels[effect] = name
+        except TypeError:
+            pass
+        return name
+
+    # --- recording ---------------------------------------------------------
+
+    def begin_frame(self):
+        self._frame = {}
+        self._frame_start = perf_counter_ns()
+
+    def end_frame(self):
+        """
+        Close the current frame and push it into the rolling window.
+        """
+        if self._frame_start is None:
+            return
+        end = perf_counter_ns()
+        self._trace.append(("frame", "frame", self._frame_start, end))
+        self._frame_times.append(end - self._frame_start)
+        self._frame_start = None
+
+        frame = self._frame
+        self._history.append(frame)
+        totals = self._totals
+        for key, ns in frame.items():
+            totals[key] = totals.get(key, 0) + ns
+        while len(self._history) > self.window:
+            old = self._history.popleft()
+            self._frame_times.popleft()
+            for key, ns in old.items():
+                left = totals[key] - ns
+                if left:
+                    totals[key] = left
+                else:
+                    del totals[key]
+        self._frame = {}
+        self.frames += 1
+
+    def record(self, name, phase, start, end):
+        """
+        Add a span [start, end) in perf_counter_ns() units to this frame.
+        """
+        key = (name, phase)
+        self._frame[key] = self._frame.get(key, 0) + (end - start)
+        self._trace.append((name, phase, start, end))
+
+    def mark(self, name, phase, start):
+        """
+        Record a span from start until now and return now, for chaining
+        consecutive sections.
+        """
+        end = perf_counter_ns()
+        self.record(name, phase, start, end)
+        return end
+
+    def update(self, effect, dt):
+        start = perf_counter_ns()
+        effect.update(dt)
+        self.record(self.label(effect), "update", start, perf_counter_ns())
+
+    def draw(self, effect, screen):
+        start = perf_counter_ns()
+        effect.draw(screen)
+        self.record(self.label(effect), "draw", start, perf_counter_ns())
+
+    def event(self, effect, event):
+        start = perf_counter_ns()
+        effect.handle_event(event)
+        self.record(self.label(effect), "event", start, perf_counter_ns())
+
+    # --- reporting ---------------------------------------------------------
+
+    def stats(self):
+        """
+        :return: {(name, phase): (mean ms per frame, max ms in one frame)}
+                 over the rolling window
+        """
+        n = len(self._history)
+        if not n:
+            return {}
+        peaks = {}
+        for frame in self._history:
+            for key, ns in frame.items():
+                if ns > peaks.get(key, 0):
+                    peaks[key] = ns
+        return {key: (total / n / 1e6, peaks[key] / 1e6) for key, total in self._totals.items()}
+
+    def top(self, n=8, phase=None):
+        """
+        The n most expensive (name, phase, mean ms, max ms) entries, slowest
+        first. Engine-level sections (phase "engine") are left out.
+
+        :param phase: only consider "event", "update" or "draw"
+        """
+        rows = [(name, ph, mean, peak) for (name, ph), (mean, peak) in self.stats().items()
+                if ph != "engine" and (phase is None or ph == phase)]
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows[:n]
+
+    def frame_ms(self):
+        """
+        :return: (mean, max) frame time in ms over the rolling window
+        """
+        times = self._frame_times
+        if not times:
+            return (0.0, 0.0)
+        return (sum(times) / len(times) / 1e6, max(times) / 1e6)
+
+    def export_chrome_trace(self, path):
+        """
+        Write the recorded spans as Chrome trace event JSON ("X" complete
+        events, microsecond timestamps), loadable in chrome://tracing and
+        the Perfetto UI.
+        """
+        epoch = self._epoch
+        pid = os.getpid()
+        events = [{"name": name, "cat": phase, "ph": "X", "pid": pid, "tid": 0,
+                   "ts": (start - epoch) / 1000.0, "dur": (end - start) / 1000.0}
+                  for name, phase, start, end in self._trace]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+
+class ProfilerOverlay(Effect):
+    """
+    On-screen table of the top-N most expensive effects. The Engine draws one
+    on top of every frame while its profiler is enabled; it can also be added
+    to a Scene like any Effect.
+    """
+    def __init__(self, profiler=None, top=8, x=8, y=8, font_size=14, refresh=0.25,
+                 color=(0,255,120), bg_color=(0,0,0,190), z_order=1000):
+        """
+        :param profiler: Profiler to show; defaults to the Scene's Engine profiler
+        :param top: number of rows
+        :param refresh: seconds between re-rendering the table
+        """
+        super().__init__(z_order=z_order)
+        self.profiler = profiler
+        self.top = top
+        self.x = x
+        self.y = y
+        self.font_size = font_size
+        self.refresh = refresh
+        self.color = color
+        self.bg_color = bg_color
+        self._surface = None
+        self._rendered_at = None
+
+    def _profiler(self):
+        if self.profiler is not None:
+            return self.profiler
+        if self.scene is not None and self.scene.engine is not None:
+            return self.scene.engine.profiler
+        return None
+
+    def get_bounds(self):
+        if self._surface is None:
+            return None
+        return self._surface.get_rect(topleft=(self.x, self.y))
+
+    def _render(self, profiler):
+        font = get_font("Courier", self.font_size)
+        mean, peak = profiler.frame_ms()
+        lines = ["frame %6.2f ms avg %6.2f max" % (mean, peak)]
+        for name, phase, mean, peak in profiler.top(self.top):
+            lines.append("%-22.22s %-6s %6.2f %6.2f" % (name, phase, mean, peak))
+        rows = [font.render(line, True, self.color) for line in lines]
+        pad = 4
+        width = max(r.get_width() for r in rows) + pad * 2
+        height = sum(r.get_height() for r in rows) + pad * 2
+        surf = pygame.Surface((width, height), pygame.SRCALPHA)
+        surf.fill(self.bg_color)
+        y = pad
+        for r in rows:
+            surf.blit(r, (pad, y))
+            y += r.get_height()
+        self._surface = surf
+
+    def draw(self, screen):
+        profiler = self._profiler()
+        if profiler is None:
+            return
+        now = perf_counter_ns()
+        # re-render a few times a second, not every frame
+        if self._surface is None or now - self._rendered_at >= self.refresh * 1e9:
+            self._render(profiler)
+            self._rendered_at = now
+        screen.blit(self._surface, (self.x, self.y))
@@ -0,0 +1,191 @@
+"""
+core/recorder.py
+
+FrameRecorder: records Engine frames without stalling the render loop.
+ - each frame is copied (one numpy copy from a surfarray view) into a
+   preallocated ring of frame buffers
+ - a pool of writer threads encodes the buffers as PNG files or stores them
+   as raw RGB24 frames in a memory-mapped file
+ - back-pressure when every ring slot is busy: "block" waits for a writer,
+   "drop" skips the frame and counts it
+
+Raw recordings get a small JSON sidecar (<path>.json) with the frame size,
+count and fps; convert them with e.g.
+    ffmpeg -f rawvideo -pix_fmt rgb24 -s 1280x720 -r 60 -i out.rgb out.mp4
+
+Used through Engine.start_recording()/stop_recording(); together with an
+offscreen Engine this records faster than real time.
+"""
+
+import json
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pygame
+
+class FrameRecorder:
+    def __init__(self, path, format="png", ring_size=8, workers=2, policy="block", fps=60,
+                 grow_frames=256):
+        """
+        :param path: "png": filename pattern with a %d for the frame number
+                     (e.g. "out/frame_%05d.png"); "raw": the output file
+        :param format: "png" or "raw"
+        :param ring_size: number of preallocated frame buffers
+        :param workers: writer threads
+        :param policy: "block" (never lose a frame) or "drop" (never wait)
+        :param fps: frame rate written to the raw sidecar
+        :param grow_frames: raw file grows by this many frames at a time
+        """
+        if format not in ("png", "raw"):
+            raise ValueError("format must be 'png' or 'raw', not %r" % format)
+        if policy not in ("block", "drop"):
+            raise ValueError("policy must be 'block' or 'drop', not %r" % policy)
+        self.path = path
+        self.format = format
+        self.ring_size = ring_size
+        self.workers = workers
+        self.policy = policy
+        self.fps = fps
+        self.grow_frames = grow_frames
+
+        self.captured = 0   # frames handed to the writers
+        self.written = 0    # frames on disk
+        self.dropped = 0    # frames skipped by the "drop" policy
+        self.size = None
+
+        self._ring = None
+        self._free = None
+        self._pool = None
+        self._lock = threading.Lock()
+        self._map = None
+        self._map_frames = 0
+        self._error = None
+
+    @property
+    def recording(self):
+        return self._pool is not None
+
+    def start(self, size):
+        """
+        Allocate the ring for frames of the given (width, height).
+        Called by capture() on the first frame if needed.
+        """
+        if self.recording:
+            return
+        width, height = size
+        self.size = (width, height)
+        self._ring = np.empty((self.ring_size, height, width, 3), dtype=np.uint8)
+        self._free = queue.Queue()
+        for slot in range(self.ring_size):
+            self._free.put(slot)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if self.format == "raw":
+            open(self.path, "wb").close()
+            self._map = None
+            self._map_frames = 0
+        self._pool = ThreadPoolExecutor(max_workers=self.workers,
+                                        thread_name_prefix="FrameRecorder")
+
+    def capture(self, surface):
+        """
+        Queue the surface's current pixels for writing.
+
+        :return: False if the frame was dropped
+        """
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        if not self.recording:
+            self.start(surface.get_size())
+        if surface.get_size() != self.size:
+            raise ValueError("frame size changed from %r to %r" % (self.size, surface.get_size()))
+
+        if self.policy == "block":
+            slot = self._free.get()
+        else:
+            try:
+                slot = self._free.get_nowait()
+            except queue.Empty:
+                self.dropped += 1
+                return False
+
+        # surfarray view is (width, height, 3) and shares the surface pixels;
+        # the one copy happens here, transposed into row-major frame order
+        view = pygame.surfarray.pixels3d(surface)
+        np.copyto(self._ring[slot], view.transpose(1, 0, 2))
+        del view
+
+        index = self.captured
+        self.captured += 1
+        self._pool.submit(self._write, slot, index)
+        return True
+
+    def _write(self, slot, index):
+        try:
+            frame = self._ring[slot]
+            if self.format == "png":
+                width, height = self.size
+                image = pygame.image.frombuffer(frame, (width, height), "RGB")
+                pygame.image.save(image, self.path % index)
+            else:
+                self._frame_map(index)[index] = frame
+            with self._lock:
+                self.written += 1
+        except Exception as e:
+            self._error = e
+        finally:
+            self._free.put(slot)
+
+    def _frame_map(self, index):
+        """
+        The memory map of the raw file, grown to hold frame `index`.
+        """
+        with self._lock:
+            if index >= self._map_frames:
+                if self._map is not None:
+                    self._map.flush()
+                frames = (index // self.grow_frames + 1) * self.grow_frames
+                width, height = self.size
+                self._map = np.memmap(self.path, dtype=np.uint8, mode="r+",
+                                      shape=(frames, height, width, 3))
+                self._map_frames = frames
+            return self._map
+
+    def stop(self):
+        """
+        Wait for every queued frame to be written and close the output.
+        """
+        if not self.recording:
+            return
+        self._pool.shutdown(wait=True)
+        self._pool = None
+        if self.format == "raw":
+            width, height = self.size
+            if self._map is not None:
+                self._map.flush()
+                self._map = None
+            # drop the unused tail left by growing in chunks
+            with open(self.path, "r+b") as f:
+                f.truncate(self.captured * width * height * 3)
+            with open(self.path + ".json", "w") as f:
+                json.dump({"width": width, "height": height, "frames": self.captured,
+                           "fps": self.fps, "pix_fmt": "rgb24"}, f)
+        self._ring = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def stats(self):
+        return {"captured": self.captured, "written": self.written, "dropped": self.dropped,
+                "pending": self.captured - self.written}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -3,84 +3,374 @@ core/scene.py
 
 Scene class: container for multiple Effects.
 New features:
- - z-order sorting each frame
- - add_effect(), remove_effect(), find_effects()
+ - z-ordered EffectContainer, kept sorted incrementally
+ - add_effect(), remove_effect(), find_effects() (O(1) type lookup)
  - indefinite or timed Scenes
+ - a SceneClock shared by all Effects (time scaling, pause, single-step)
+ - a Tweener (scene.tweens) advanced in one batched pass per frame
+ - opt-in dirty-rect rendering (only repaint regions effects touched)
+ - spatial index of effect bounds: mouse events go only to effects under
+   the cursor, query_rect()/effects_at() for overlap queries
+ - events routed by type through a dispatch table of subscribed effects
+ - per-effect event/update/draw timing while the Engine's profiler is on
+ - named layers; cached layers are re-rendered only when their effects change
+ - spawn(): coroutines that live as long as the Scene (Engine.run_async())
 """
 
 import pygame
 
+from core.clock import SceneClock
+from core.container import EffectContainer
+from core.layer import Layer
+from core.tween import Tweener
+from core.spatial import SpatialGrid
+
+# events carrying a .pos, routed by the spatial index
+POSITIONAL_EVENTS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
+def _z_key(effect):
+    return (effect.z_order, effect._container_seq)
+
 class Scene:
-    def __init__(self, effects=None, duration=0.0):
+    def __init__(self, effects=None, duration=0.0, dirty_rects=False, background=(0,0,0), layers=None):
         """
         :param effects: list of Effects
         :param duration: scene ends after this many seconds if > 0
+        :param dirty_rects: if True, draw() only repaints the regions effects
+                            report via get_bounds() and returns them so the
+                            Engine can push just those rects to the display
+        :param background: fill color or Surface restored behind effects
+        :param layers: layer names (or Layers) back to front; None stands for
+                       the default live layer and is put on top if missing.
+                       Named layers are cached. See add_layer().
         """
         self.effects = effects if effects else []
         self.duration = duration
         self.playing = True
         self.engine = None
+        self.profiler = None  # the Engine's Profiler, set by reset()
+        self.started = False  # reset() ran: effects added from now on are reset right away
+        self.dirty_rects = dirty_rects
+        self.background = background
+        self.clock = SceneClock()
+        self.tweens = Tweener()
 
         self._time_in_scene = 0.0
 
+        # dirty-rect bookkeeping
+        self._background_buffer = None
+        self._prev_bounds = {}
+        self._full_redraw = True
+        self._invalid = []    # rects painted over from outside the Scene
+
+        # spatial index of effect bounds: rebuilt when effects are added or
+        # removed, otherwise only effects that were dirty after an update
+        # (non-static ones always are) or whose bounds moved get re-indexed
+        self.spatial = SpatialGrid()
+        self._unbounded = set()
+        self._index_stale = True       # full rebuild needed
+        self._index_version = None     # container version the index was built at
+        self._index_moved = set()      # effects whose bounds may have changed
+
+        # event type -> (effects in z_order, same as a set), per container version
+        self._routes = {}
+        self._routes_version = None
+
+        self.layers = [Layer(None, cached=False)]
+        if layers is not None:
+            self.layers = []
+            for layer in layers:
+                self.add_layer(layer if isinstance(layer, Layer) else Layer(layer, cached=layer is not None))
+            if self.get_layer(None) is None:
+                self.layers.append(Layer(None, cached=False))
+
+    @property
+    def effects(self):
+        """
+        The Scene's EffectContainer, iterated in z_order.
+        """
+        return self._effects
+
+    @effects.setter
+    def effects(self, effects):
+        self._effects = effects if isinstance(effects, EffectContainer) else EffectContainer(effects)
+        self._index_stale = True
+        # a new container counts versions from scratch: drop cached routes
+        self._routes = {}
+        self._routes_version = None
+
     def reset(self, engine):
         """
         Called by the Engine when the Scene starts.
         """
         self.engine = engine
+        self.profiler = engine.profiler if engine is not None else None
+        self.started = True
         self.playing = True
+        self.clock.reset()
+        self.tweens.clear()
         self._time_in_scene = 0.0
+        self._prev_bounds = {}
+        self._full_redraw = True
+        self._index_stale = True
+        for layer in self.layers:
+            layer.invalidate()
 
         for e in self.effects:
+            e.scene = self
             e.reset()
 
+    def screen_size(self):
+        """
+        Size of the surface this Scene renders to: the Engine's screen (which
+        may be offscreen) or, without an Engine, the display surface.
+        """
+        if self.engine is not None:
+            return self.engine.screen.get_size()
+        surface = pygame.display.get_surface()
+        if surface is None:
+            raise RuntimeError("Scene.screen_size() needs an Engine or a display surface")
+        return surface.get_size()
+
     def add_effect(self, effect):
         """
-        Dynamically add an Effect to the scene.
+        Dynamically add an Effect to the scene. Before the Scene has started
+        the effect is reset along with the others when it does, once the
+        screen it renders to is known.
         """
-        effect.reset()
-        self.effects.append(effect)
+        effect.scene = self
+        if self.started:
+            effect.reset()
+        self.effects.add(effect)
+        self._index_stale = True
+
+    def spawn(self, coro):
+        """
+        Run a coroutine on the Engine's event loop until this Scene ends,
+        e.g. a data feed. Effects can call self.scene.spawn() from reset().
+        """
+        if self.engine is None:
+            coro.close()
+            raise RuntimeError("Scene.spawn() needs the Scene to be started by an Engine")
+        return self.engine.spawn(coro, self)
 
     def remove_effect(self, effect):
         """
         Dynamically remove an Effect from the scene.
         """
-        if effect in self.effects:
-            self.effects.remove(effect)
+        self.effects.discard(effect)
+        self._index_stale = True
+
+    def invalidate(self, rect=None):
+        """
+        Force rect (or the whole screen) to be repainted by the next
+        dirty-rect draw, e.g. after something outside the Scene drew over it.
+        """
+        if rect is None:
+            self._full_redraw = True
+        else:
+            self._invalid.append(pygame.Rect(rect))
+
+    def add_layer(self, layer, index=None, cached=True):
+        """
+        Add a layer, on top of the others unless index says otherwise
+        (index=0 puts it at the bottom, e.g. for static backgrounds).
+
+        :param layer: a name or a Layer
+        :return: the Layer
+        """
+        if not isinstance(layer, Layer):
+            layer = Layer(layer, cached=cached)
+        if self.get_layer(layer.name) is not None:
+            raise ValueError("duplicate layer %r" % (layer.name,))
+        if index is None:
+            self.layers.append(layer)
+        else:
+            self.layers.insert(index, layer)
+        return layer
+
+    def get_layer(self, name):
+        for layer in self.layers:
+            if layer.name == name:
+                return layer
+        return None
+
+    def _group_layers(self, effects):
+        """
+        Split effects (in z_order) by layer. Effects naming a layer the Scene
+        doesn't have get a new cached layer on top.
+        """
+        groups = {layer.name: [] for layer in self.layers}
+        for e in effects:
+            group = groups.get(e.layer)
+            if group is None:
+                self.add_layer(e.layer)
+                group = groups[e.layer] = []
+            group.append(e)
+        return groups
 
     def find_effects(self, effect_type):
         """
-        Returns a list of effects of the given class/type.
+        Returns a list of effects of the given class/type, in the order
+        they were added.
         """
-        return [e for e in self.effects if isinstance(e, effect_type)]
+        return self.effects.find(effect_type)
 
-    def handle_event(self, event):
+    def _refresh_index(self):
+        """
+        Sync the spatial index with current effect bounds. Effects without
+        bounds (get_bounds() is None) are kept aside: they could be anywhere.
+        Only effects noted by _track_index() are looked at again, unless
+        effects were added, removed or re-ordered since the last rebuild.
+        """
+        if self._index_stale or self._index_version != self.effects.version:
+            self._rebuild_index()
+            return
+        moved = self._index_moved
+        if not moved:
+            return
+        index = self.spatial
+        unbounded = self._unbounded
+        effects = self.effects
+        for e in moved:
+            if e._container is not effects:
+                continue  # marked dirty after leaving the Scene
+            bounds = e.get_bounds()
+            if bounds is None:
+                index.remove(e)
+                unbounded.add(e)
+            else:
+                index.insert(e, bounds)
+                unbounded.discard(e)
+        moved.clear()
+
+    def bounds_changed(self, effect):
         """
-        Pass events to all Effects if they're active.
+        Re-read effect's bounds at the next spatial lookup (mark_dirty()
+        calls this, so changes made outside update() are seen right away).
         """
+        if self._index_version is not None:
+            self._index_moved.add(effect)
+
+    def _track_index(self):
+        """
+        After an update, note the effects whose bounds may have changed. Done
+        right away: drawing clears the dirty flags before the next lookup.
+        Clean effects are compared against their indexed rect, since static
+        ones can be moved (by a tween, or by assigning x/y) without being
+        marked dirty.
+        """
+        if self._index_version is None:
+            return  # never queried: nothing to keep up to date
+        moved = self._index_moved
+        rect_of = self.spatial.rect_of
+        unbounded = self._unbounded
+        for e in self.effects:
+            if e.is_dirty:
+                moved.add(e)
+                continue
+            bounds = e.get_bounds()
+            if bounds is None:
+                if e not in unbounded:
+                    moved.add(e)
+            elif rect_of(e) != bounds:
+                moved.add(e)
+
+    def _rebuild_index(self):
+        index = self.spatial
+        seen = set()
+        unbounded = set()
         for e in self.effects:
-            if e.is_active:
-                e.handle_event(event)
+            bounds = e.get_bounds()
+            if bounds is None:
+                unbounded.add(e)
+            else:
+                index.insert(e, bounds)
+                seen.add(e)
+        if len(seen) != len(index):
+            for e in [e for e in index if e not in seen]:
+                index.remove(e)
+        self._unbounded = unbounded
+        self._index_stale = False
+        self._index_version = self.effects.version
+        self._index_moved.clear()
+
+    def effects_at(self, pos):
+        """
+        Effects whose bounds contain pos, in z_order.
+        """
+        self._refresh_index()
+        return sorted(self.spatial.query_point(pos), key=_z_key)
+
+    def query_rect(self, rect):
+        """
+        Effects whose bounds intersect rect, in z_order.
+        """
+        self._refresh_index()
+        return sorted(self.spatial.query_rect(rect), key=_z_key)
+
+    def _route(self, event_type):
+        """
+        Effects subscribed to event_type, built on first use and dropped
+        whenever effects are added, removed or re-ordered.
+        """
+        if self._routes_version != self.effects.version:
+            self._routes.clear()
+            self._routes_version = self.effects.version
+        route = self._routes.get(event_type)
+        if route is None:
+            subscribers = [e for e in self.effects if e.subscribes_to(event_type)]
+            route = self._routes[event_type] = (subscribers, set(subscribers))
+        return route
+
+    def handle_event(self, event):
+        """
+        Pass events to the active Effects subscribed to their type. Mouse
+        events only go to those under the cursor (or reporting no bounds).
+        """
+        subscribers, subscriber_set = self._route(event.type)
+        if subscribers and event.type in POSITIONAL_EVENTS:
+            self._refresh_index()
+            hits = self.spatial.query_point(event.pos)
+            if self._unbounded:
+                hits |= self._unbounded
+            subscribers = sorted(hits & subscriber_set, key=_z_key)
+        prof = self.profiler
+        if prof is not None and prof.enabled:
+            for e in subscribers:
+                if e.is_active:
+                    prof.event(e, event)
+        else:
+            for e in subscribers:
+                if e.is_active:
+                    e.handle_event(event)
 
         # Example: handle window resize
         if event.type == pygame.VIDEORESIZE:
-            # For demonstration, let's just center the scene or do something
-            # Actually you'd recalc positions. We'll skip for brevity.
-            pass
+            # Effects may recalc positions; the whole frame must be repainted.
+            self._full_redraw = True
 
     def update(self, dt):
         """
-        Update all Effects. Sort them by z_order. Remove dead ones.
+        Update all Effects. Killed effects drop out of the container as they
+        die, and z_order changes re-sort it lazily, so there is no per-frame
+        rebuild or sort.
+        dt is real time; Effects receive it scaled by the Scene's clock and
+        are not updated at all while the clock is paused.
         """
-        self._time_in_scene += dt
-        for e in self.effects:
-            e.update(dt)
-
-        # remove dead
-        self.effects = [e for e in self.effects if not e._should_remove]
-
-        # sort by z_order ascending
-        self.effects.sort(key=lambda e: e.z_order)
+        dt = self.clock.tick(dt)
+        if dt is None:
+            return
+        self._time_in_scene = self.clock.time
+        self.tweens.update(dt)
+        prof = self.profiler
+        if prof is not None and prof.enabled:
+            for e in self.effects:
+                prof.update(e, dt)
+        else:
+            for e in self.effects:
+                e.update(dt)
+        self._track_index()
 
         # if scene has a finite duration
         if self.duration > 0 and self._time_in_scene >= self.duration:
@@ -89,9 +379,172 @@ class Scene:
     def draw(self, screen):
         """
         Clear screen (or draw a background), then draw Effects in z_order.
+
+        :return: None if the whole screen should be presented, otherwise the
+                 list of rects that changed (dirty-rect mode only)
         """
-        screen.fill((0,0,0))
+        prof = self.profiler
+        if prof is not None and not prof.enabled:
+            prof = None
+        if self.dirty_rects:
+            return self._draw_dirty(screen, prof.draw if prof else _draw_effect)
+        if len(self.layers) > 1:
+            return self._draw_layers(screen, prof.draw if prof else _draw_effect)
 
+        self._fill_background(screen)
+
+        if prof is not None:
+            for e in self.effects:
+                if e.is_active:
+                    prof.draw(e, screen)
+                    e.clear_dirty()
+        else:
+            for e in self.effects:
+                if e.is_active:
+                    e.draw(screen)
+                    e.clear_dirty()
+
+    def _draw_layers(self, screen, draw, groups=None, background=True):
+        """
+        Composite the layers back to front onto screen.
+
+        :param groups: layer name -> active effects, from _group_layers()
+        :param background: paint the Scene background first (or let a
+                           cached bottom layer carry it)
+        """
+        if groups is None:
+            groups = self._group_layers([e for e in self.effects if e.is_active])
+        size = screen.get_size()
+        for i, layer in enumerate(self.layers):
+            effects = groups[layer.name]
+            if layer.cached:
+                opaque = background and i == 0
+                surf = layer.render(self, effects, size, draw, opaque)
+                if effects or opaque:
+                    screen.blit(surf, (0,0))
+            else:
+                if background and i == 0:
+                    self._fill_background(screen)
+                for e in effects:
+                    draw(e, screen)
+                    e.clear_dirty()
+
+    def _fill_background(self, screen, rect=None):
+        if isinstance(self.background, pygame.Surface):
+            screen.blit(self.background, rect or (0,0), rect)
+        else:
+            screen.fill(self.background, rect)
+
+    def _draw_dirty(self, screen, draw=None):
+        """
+        Repaint only what changed: every active effect reports its bounds, and
+        the union of old + new bounds of dirty/moved effects is restored from
+        the background buffer and redrawn (clipped) in z_order.
+
+        :param draw: draw(effect, screen) callable (the profiler's when timing)
+        """
+        if draw is None:
+            draw = _draw_effect
+        screen_rect = screen.get_rect()
+        if self._background_buffer is None or self._background_buffer.get_size() != screen_rect.size:
+            self._background_buffer = pygame.Surface(screen_rect.size).convert() \
+                if pygame.display.get_surface() else pygame.Surface(screen_rect.size)
+            self._fill_background(self._background_buffer)
+            self._full_redraw = True
+
+        full = self._full_redraw
+        current = {}
+        dirty = [r.clip(screen_rect) for r in self._invalid]
+        self._invalid = []
         for e in self.effects:
-            if e.is_active:
-                e.draw(screen)
+            if not e.is_active:
+                continue
+            bounds = e.get_bounds()
+            if bounds is None:
+                full = True
+                break
+            bounds = pygame.Rect(bounds).clip(screen_rect)
+            current[e] = bounds
+            prev = self._prev_bounds.get(e)
+            if prev is None:
+                dirty.append(bounds)
+            elif prev != bounds:
+                dirty.append(bounds)
+                dirty.append(prev)
+            elif e.is_dirty:
+                dirty.append(bounds)
+
+        if not full:
+            # effects that vanished (killed, removed) leave their old region behind
+            for e, prev in self._prev_bounds.items():
+                if e not in current:
+                    dirty.append(prev)
+
+        layered = len(self.layers) > 1
+        if full:
+            screen.blit(self._background_buffer, (0,0))
+            self._prev_bounds = {}
+            active = [e for e in self.effects if e.is_active]
+            if layered:
+                self._draw_layers(screen, draw, background=False)
+            for e in active:
+                if not layered:
+                    draw(e, screen)
+                e.clear_dirty()
+                bounds = e.get_bounds()
+                if bounds is not None:
+                    self._prev_bounds[e] = pygame.Rect(bounds).clip(screen_rect)
+            self._full_redraw = False
+            return [screen_rect]
+
+        rects = _merge_rects([r for r in dirty if r.width and r.height])
+        if layered:
+            groups = self._group_layers(current)
+            # bring cached layers up to date before any region reads them
+            size = screen_rect.size
+            surfaces = [layer.render(self, groups[layer.name], size, draw) if layer.cached else None
+                        for layer in self.layers]
+        for rect in rects:
+            screen.set_clip(rect)
+            screen.blit(self._background_buffer, rect, rect)
+            if layered:
+                for layer, surf in zip(self.layers, surfaces):
+                    if surf is not None:
+                        if groups[layer.name]:
+                            screen.blit(surf, rect, rect)
+                    else:
+                        for e in groups[layer.name]:
+                            if current[e].colliderect(rect):
+                                draw(e, screen)
+            else:
+                for e, bounds in current.items():
+                    if bounds.colliderect(rect):
+                        draw(e, screen)
+        screen.set_clip(None)
+
+        for e in current:
+            e.clear_dirty()
+        self._prev_bounds = current
+        return rects
+
+
+def _draw_effect(effect, screen):
+    effect.draw(screen)
+
+def _merge_rects(rects):
+    """
+    Collapse overlapping rects so no pixel is repainted twice.
+    Quadratic in the number of dirty rects, which stays small per frame.
+    """
+    merged = []
+    for r in rects:
+        r = r.copy()
+        i = 0
+        while i < len(merged):
+            if merged[i].colliderect(r):
+                r.union_ip(merged.pop(i))
+                i = 0
+            else:
+                i += 1
+        merged.append(r)
+    return merged
@@ -0,0 +1,113 @@
+"""
+core/spatial.py
+
+SpatialGrid: a uniform-grid spatial index of objects by bounding rect.
+Used by the Scene to find effects under the mouse and effects overlapping a
+rect without testing every effect.
+"""
+
+import pygame
+
+
+class SpatialGrid:
+    def __init__(self, cell_size=128):
+        """
+        :param cell_size: grid cell size in pixels; roughly the size of a
+                          typical widget works well
+        """
+        self.cell_size = cell_size
+        self._cells = {}   # (cx, cy) -> set of objects
+        self._rects = {}   # object -> (Rect, cell range)
+
+    def _cell_range(self, rect):
+        cs = self.cell_size
+        return (rect.left // cs, rect.top // cs,
+                (rect.right - 1) // cs if rect.width else rect.left // cs,
+                (rect.bottom - 1) // cs if rect.height else rect.top // cs)
+
+    def insert(self, obj, rect):
+        """
+        Add obj with the given bounding rect, or move it if already present.
+        """
+        rect = pygame.Rect(rect)
+        old = self._rects.get(obj)
+        if old is not None:
+            if old[0] == rect:
+                return
+            cells = self._cell_range(rect)
+            if cells == old[1]:
+                self._rects[obj] = (rect, cells)
+                return
+            self._unlink(obj, old[1])
+        else:
+            cells = self._cell_range(rect)
+        self._rects[obj] = (rect, cells)
+        x0, y0, x1, y1 = cells
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket is None:
+                    bucket = self._cells[(cx, cy)] = set()
+                bucket.add(obj)
+
+    update = insert
+
+    def remove(self, obj):
+        old = self._rects.pop(obj, None)
+        if old is not None:
+            self._unlink(obj, old[1])
+
+    def _unlink(self, obj, cells):
+        x0, y0, x1, y1 = cells
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.discard(obj)
+                    if not bucket:
+                        del self._cells[(cx, cy)]
+
+    def rect_of(self, obj):
+        entry = self._rects.get(obj)
+        return entry[0] if entry else None
+
+    def query_point(self, point):
+        """
+        :return: set of objects whose rect contains point
+        """
+        x, y = point
+        cs = self.cell_size
+        bucket = self._cells.get((int(x) // cs, int(y) // cs))
+        if not bucket:
+            return set()
+        rects = self._rects
+        return {obj for obj in bucket if rects[obj][0].collidepoint(x, y)}
+
+    def query_rect(self, rect):
+        """
+        :return: set of objects whose rect intersects rect
+        """
+        rect = pygame.Rect(rect)
+        x0, y0, x1, y1 = self._cell_range(rect)
+        found = set()
+        cells = self._cells
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found |= bucket
+        rects = self._rects
+        return {obj for obj in found if rects[obj][0].colliderect(rect)}
+
+    def clear(self):
+        self._cells.clear()
+        self._rects.clear()
+
+    def __contains__(self, obj):
+        return obj in self._rects
+
+    def __len__(self):
+        return len(self._rects)
+
+    def __iter__(self):
+        return iter(self._rects)
@@ -0,0 +1,32 @@
+"""
+core/sprites.py
+
+Helpers for the pre-rendered sprites and atlases effects blit from.
+ - display_format(): convert a sprite to the display's pixel format for fast
+   blits, or leave it as is when there is no display (offscreen Engine)
+ - circle_sprites(): a filled circle at evenly spaced alpha levels, the
+   building block of particle and spark atlases
+"""
+
+import pygame
+
+def display_format(surf, alpha=True):
+    """
+    surf converted with convert_alpha() (or convert() if alpha is False)
+    once a display exists; otherwise surf itself.
+    """
+    if pygame.display.get_surface() is None:
+        return surf
+    return surf.convert_alpha() if alpha else surf.convert()
+
+def circle_sprites(color, radius, levels):
+    """
+    `levels` sprites of a circle of the given radius, centered in a
+    (2*radius, 2*radius) Surface; sprite i has alpha 255 * (i + 1) / levels.
+    """
+    sprites = []
+    for level in range(levels):
+        surf = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
+        pygame.draw.circle(surf, (*color[:3], int(255 * (level + 1) / levels)), (radius, radius), radius)
+        sprites.append(display_format(surf))
+    return sprites
@@ -0,0 +1,174 @@
+"""
+core/tasks.py
+
+Asyncio integration for the Engine (see Engine.run_async()):
+ - spawn(): run coroutines on the event loop; ones owned by a Scene are
+   cancelled when that Scene ends, all of them when the Engine stops
+ - call_soon(): callbacks into the scene (from coroutines or threads) are
+   queued and run at the start of a frame, for at most `budget` seconds per
+   frame; the rest waits for the next frame
+ - throttle(): long-running coroutines await it between chunks of work, so
+   they only run in the gap between frames, for at most `budget` seconds
+"""
+
+import asyncio
+from collections import deque
+from time import perf_counter
+
+class FrameTasks:
+    def __init__(self, budget=0.004):
+        """
+        :param budget: seconds per frame for queued callbacks, and for
+                       throttled coroutines between frames
+        """
+        self.budget = budget
+        self.loop = None
+        self.callbacks_run = 0
+        self.over_budget = 0      # frames that left callbacks for the next one
+        self._callbacks = deque()  # (callback, args), appended from any thread
+        self._tasks = {}           # task -> owner (a Scene, or None)
+        self._pending = []         # (coroutine, owner) spawned before the loop ran
+        self._waiters = []         # futures of throttled coroutines
+        self._slice_end = 0.0
+
+    # --- coroutines --------------------------------------------------------
+
+    def attach(self, loop):
+        """
+        Start running coroutines on `loop`, including those spawned earlier.
+        """
+        self.loop = loop
+        pending, self._pending = self._pending, []
+        for coro, owner in pending:
+            self.spawn(coro, owner)
+
+    async def detach(self):
+        """
+        Cancel every task and wait for them to finish.
+        """
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._release_waiters()
+        self.loop = None
+
+    def close(self):
+        """
+        Drop coroutines that never got a loop to run on (synchronous run()).
+        """
+        pending, self._pending = self._pending, []
+        for coro, owner in pending:
+            coro.close()
+
+    def spawn(self, coro, owner=None):
+        """
+        Schedule a coroutine. Before the loop runs it is kept until attach().
+
+        :param owner: a Scene; the task is cancelled when the Scene ends
+        :return: the asyncio.Task, or None if it has to wait for the loop
+        """
+        if self.loop is None:
+            self._pending.append((coro, owner))
+            return None
+        task = self.loop.create_task(coro)
+        self._tasks[task] = owner
+        task.add_done_callback(self._done)
+        return task
+
+    def _done(self, task):
+        self._tasks.pop(task, None)
+        if not task.cancelled() and task.exception() is not None:
+            # surface errors right away instead of at garbage collection
+            task.get_loop().call_exception_handler({"message": "Engine task failed",
+                                                    "exception": task.exception(), "task": task})
+
+    def cancel(self, owner):
+        """
+        Cancel the tasks (and not yet started coroutines) owned by `owner`.
+        """
+        for task, task_owner in list(self._tasks.items()):
+            if task_owner is owner:
+                task.cancel()
+        keep = []
+        for coro, coro_owner in self._pending:
+            if coro_owner is owner:
+                coro.close()
+            else:
+                keep.append((coro, coro_owner))
+        self._pending = keep
+
+    def __len__(self):
+        return len(self._tasks) + len(self._pending)
+
+    # --- budgets -----------------------------------------------------------
+
+    @property
+    def queued(self):
+        """
+        Callbacks waiting for a frame.
+        """
+        return len(self._callbacks)
+
+    def call_soon(self, callback, *args):
+        """
+        Run callback(*args) at the start of a coming frame; safe to call from
+        any thread or coroutine.
+        """
+        self._callbacks.append((callback, args))
+
+    def run_callbacks(self, budget=None):
+        """
+        Run queued callbacks, oldest first, until the queue is empty or the
+        budget is spent (at least one always runs).
+
+        :return: number of callbacks run
+        """
+        queue = self._callbacks
+        if not queue:
+            return 0
+        deadline = perf_counter() + (self.budget if budget is None else budget)
+        popleft = queue.popleft
+        ran = 0
+        while queue:
+            callback, args = popleft()
+            callback(*args)
+            ran += 1
+            if perf_counter() >= deadline:
+                if queue:
+                    self.over_budget += 1
+                break
+        self.callbacks_run += ran
+        return ran
+
+    def open_slice(self, end):
+        """
+        A frame is done: throttled coroutines may run until `end` (loop time).
+        """
+        self._slice_end = end
+        self._release_waiters()
+
+    def _release_waiters(self):
+        waiters, self._waiters = self._waiters, []
+        for future in waiters:
+            if not future.done():
+                future.set_result(None)
+
+    async def throttle(self):
+        """
+        Await between chunks of work: returns right away (after yielding to
+        the loop) while this frame's slice lasts, otherwise after the next
+        frame is drawn.
+        """
+        loop = asyncio.get_running_loop()
+        if loop.time() < self._slice_end:
+            await asyncio.sleep(0)
+            return
+        future = loop.create_future()
+        self._waiters.append(future)
+        await future
+
+    def stats(self):
+        return {"tasks": len(self._tasks), "pending": len(self._pending), "queued": len(self._callbacks),
+                "callbacks_run": self.callbacks_run, "over_budget": self.over_budget}
@@ -2,17 +2,75 @@
 core/transition.py
 
 More robust transitions:
+ - ScreenOverlay: reusable full-screen tint / tiled texture
  - FadeTransition (in or out)
  - GlitchTransition with random horizontal slices
  - SlideTransition (optional)
 """
 
 import pygame
-import random
+import numpy as np
 import time
 import math
+from collections import OrderedDict
 from core.effect import Effect
 
+class ScreenOverlay:
+    """
+    A full-screen tint (solid color) or tiled texture blended over the screen.
+
+    The overlay surface is built once per screen size and reused; the blend
+    strength is set with surface-level alpha, so drawing allocates nothing.
+    Not an Effect: transitions and overlay effects own one and draw it.
+    """
+    def __init__(self, color=(0,0,0), texture=None):
+        """
+        :param color: tint color (ignored if texture is given)
+        :param texture: Surface tiled across the whole screen
+        """
+        self.color = color
+        self.texture = texture
+        self._surf = None
+        self._key = None
+
+    def surface(self, size):
+        """
+        The cached full-screen overlay surface for this size.
+        """
+        key = (size, tuple(self.color), id(self.texture))
+        if key != self._key:
+            self._surf = self._build(size)
+            self._key = key
+        return self._surf
+
+    def _build(self, size):
+        if self.texture is None:
+            surf = pygame.Surface(size)
+            surf.fill(self.color)
+        else:
+            surf = pygame.Surface(size, self.texture.get_flags() & pygame.SRCALPHA)
+            tex_w, tex_h = self.texture.get_size()
+            surf.blits([(self.texture, (x, y)) for y in range(0, size[1], tex_h)
+                        for x in range(0, size[0], tex_w)], doreturn=False)
+        if pygame.display.get_surface():
+            surf = surf.convert_alpha() if surf.get_flags() & pygame.SRCALPHA else surf.convert()
+        return surf
+
+    def draw(self, screen, alpha=255):
+        """
+        Blend the overlay over the whole screen with the given alpha (0..255).
+        """
+        alpha = int(alpha)
+        if alpha <= 0:
+            return
+        if alpha >= 255 and self.texture is None:
+            screen.fill(self.color)
+            return
+        surf = self.surface(screen.get_size())
+        surf.set_alpha(min(alpha, 255))
+        screen.blit(surf, (0,0))
+
+
 class FadeTransition(Effect):
     """
     Fade in or out over `duration` seconds
@@ -26,6 +84,7 @@ class FadeTransition(Effect):
         self.color = color
         self.elapsed = 0.0
         self.alpha = 255 if fade_in else 0
+        self._overlay = ScreenOverlay(color)
 
     def reset(self):
         super().reset()
@@ -50,26 +109,56 @@ class FadeTransition(Effect):
     def draw(self, screen):
         if not self.is_active:
             return
-        overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-        # color fill with alpha
-        overlay.fill((*self.color, self.alpha))
-        screen.blit(overlay, (0,0))
+        self._overlay.color = self.color
+        self._overlay.draw(screen, self.alpha)
 
 
 class GlitchTransition(Effect):
     """
     Glitch: random horizontal slices offset, plus noise overlay.
+
+    Noise comes from a few small tiles generated with NumPy when the
+    transition is reset (not on its first frame), shared by all glitches of
+    the same style in a small LRU cache. Each frame one tile is repeated
+    over the screen from a random offset, and slice positions/offsets are
+    drawn as arrays from a seeded generator, so a frame costs a handful of
+    blits at any resolution and memory doesn't grow with screen size.
     """
-    def __init__(self, duration=1.0):
+    # (tile, noise pixels per tile, alpha, pool size, seed) -> [Surface]
+    _noise_pools = OrderedDict()
+    noise_cache_size = 4
+    tile_size = 256
+
+    def __init__(self, duration=1.0, noise_density=0.0006, noise_alpha=80,
+                 slice_count=5, max_offset=20, pool_size=8, seed=None):
+        """
+        :param noise_density: fraction of screen pixels covered by noise
+        :param slice_count: horizontal slices displaced per frame
+        :param max_offset: max horizontal slice displacement in pixels
+        :param pool_size: distinct noise tiles cycled through
+        :param seed: seed for noise and slices, for reproducible glitches
+        """
         super().__init__(z_order=9999)
         self.duration = duration
+        self.noise_density = noise_density
+        self.noise_alpha = noise_alpha
+        self.slice_count = slice_count
+        self.max_offset = max_offset
+        self.pool_size = pool_size
+        self.seed = seed
         self.start_surf = None
         self.elapsed = 0.0
+        self._rng = np.random.default_rng(seed)
+        self._noise = None
+        self._capture = None  # screen capture buffer, reused across runs
 
     def reset(self):
         super().reset()
         self.start_surf = None
         self.elapsed = 0.0
+        self._rng = np.random.default_rng(self.seed)
+        # build (or fetch) the noise now, so the first frame doesn't pay for it
+        self._noise = self.noise_pool()
 
     def update(self, dt):
         super().update(dt)
@@ -79,33 +168,79 @@ class GlitchTransition(Effect):
         if self.duration > 0 and self.elapsed >= self.duration:
             self.kill()
 
+    def noise_pool(self):
+        """
+        The shared noise tiles for this style, generated on first use.
+        """
+        t = self.tile_size
+        count = int(self.noise_density * t * t)
+        key = (t, count, self.noise_alpha, self.pool_size, self.seed)
+        pools = self._noise_pools
+        pool = pools.get(key)
+        if pool is None:
+            rng = np.random.default_rng(self.seed)
+            pool = pools[key] = [self._make_noise((t, t), count, rng) for _ in range(self.pool_size)]
+            while len(pools) > self.noise_cache_size:
+                pools.popitem(last=False)
+        else:
+            pools.move_to_end(key)
+        return pool
+
+    def _make_noise(self, size, count, rng):
+        # RLE-encoded per-pixel alpha: blitting the mostly transparent
+        # texture only touches the noise pixels.
+        w, h = size
+        surf = pygame.Surface(size, pygame.SRCALPHA)
+        surf.fill((0, 0, 0, 0))
+        flat = rng.choice(w * h, size=min(count, w * h), replace=False)
+        xs, ys = flat % w, flat // w
+        pixels = pygame.surfarray.pixels3d(surf)
+        pixels[xs, ys] = rng.integers(0, 256, size=(len(flat), 3), dtype=np.uint8)
+        del pixels  # unlock the surface
+        alpha = pygame.surfarray.pixels_alpha(surf)
+        alpha[xs, ys] = self.noise_alpha
+        del alpha
+        surf.set_alpha(255, pygame.RLEACCEL)
+        # SDL encodes RLE on first blit; do it now rather than mid-transition
+        pygame.Surface((1, 1)).blit(surf, (0, 0))
+        return surf
+
     def draw(self, screen):
         if not self.is_active:
             return
         if self.start_surf is None:
-            # capture screen
-            self.start_surf = screen.copy()
+            # capture screen, into the previous run's buffer if it fits
+            capture = self._capture
+            if capture is not None and capture.get_size() == screen.get_size():
+                capture.blit(screen, (0, 0))
+            else:
+                capture = self._capture = screen.copy()
+            self.start_surf = capture
 
         # start by blitting the captured screen
         screen.blit(self.start_surf, (0,0))
 
-        # slice offset
-        h = screen.get_height()
-        w = screen.get_width()
-        for _ in range(5):
-            slice_y = random.randint(0, h-10)
-            slice_h = random.randint(5, 20)
-            offset_x = random.randint(-20, 20)
-            region = self.start_surf.subsurface((0, slice_y, w, slice_h))
-            screen.blit(region, (offset_x, slice_y))
-
-        # draw noise
-        noise_surf = pygame.Surface((w, h), pygame.SRCALPHA)
-        for _ in range(300):
-            nx = random.randint(0, w-1)
-            ny = random.randint(0, h-1)
-            noise_surf.set_at((nx, ny), (random.randint(0,255), random.randint(0,255), random.randint(0,255), 80))
-        screen.blit(noise_surf, (0,0))
+        # slice offset, all slices drawn in one batch
+        w, h = screen.get_size()
+        rng = self._rng
+        n = self.slice_count
+        if n > 0 and h > 10:
+            ys = rng.integers(0, h - 9, n)
+            heights = np.minimum(rng.integers(5, 21, n), h - ys)
+            offsets = rng.integers(-self.max_offset, self.max_offset + 1, n)
+            src = self.start_surf
+            screen.blits([(src, (x, y), (0, y, w, sh))
+                          for x, y, sh in zip(offsets.tolist(), ys.tolist(), heights.tolist())],
+                         doreturn=False)
+
+        # draw noise: one tile repeated over the screen from a random offset
+        pool = self._noise if self._noise is not None else self.noise_pool()
+        if pool:
+            tile = pool[rng.integers(len(pool))]
+            t = self.tile_size
+            ox, oy = rng.integers(0, t, 2).tolist()
+            screen.blits([(tile, (x, y)) for y in range(-oy, h, t) for x in range(-ox, w, t)],
+                         doreturn=False)
 
 
 class SlideTransition(Effect):
@@ -0,0 +1,193 @@
+"""
+core/tween.py
+
+Tweens animate any numeric attribute of any object from a start to an end
+value over a duration, shaped by an easing function from core.utils.
+
+A Tweener keeps all of its tweens in NumPy arrays and advances them in one
+batched pass per frame: progress and easing are computed for every tween at
+once (one easing call per distinct easing function), then values are
+written back with setattr. Each Scene owns a Tweener (scene.tweens) that it
+advances with the scene clock.
+"""
+
+import numpy as np
+
+from core.utils import ease_in_out
+
+
+class Tween:
+    """
+    Handle for one running tween; returned by Tweener.tween().
+    """
+    __slots__ = ("target", "attr", "start", "end", "duration", "delay",
+                 "easing", "on_complete", "finished", "_tweener")
+
+    def __init__(self, target, attr, start, end, duration, delay, easing, on_complete):
+        self.target = target
+        self.attr = attr
+        self.start = start
+        self.end = end
+        self.duration = duration
+        self.delay = delay
+        self.easing = easing
+        self.on_complete = on_complete
+        self.finished = False
+        self._tweener = None
+
+    def cancel(self):
+        """
+        Stop the tween where it is; on_complete is not called.
+        """
+        if self._tweener is not None:
+            self._tweener.cancel(self)
+
+
+class Tweener:
+    def __init__(self, capacity=64):
+        self._tweens = []
+        self._start = np.zeros(capacity)
+        self._delta = np.zeros(capacity)
+        self._duration = np.ones(capacity)
+        self._elapsed = np.zeros(capacity)  # includes delay
+        self._delay = np.zeros(capacity)
+        self._easing_id = np.zeros(capacity, dtype=np.intp)
+        self._easings = []      # distinct easing functions, indexed by _easing_id
+        self._cancelled = False
+
+    def tween(self, target, attr, end, duration, easing=ease_in_out, start=None, delay=0.0, on_complete=None):
+        """
+        Animate target.attr to `end` over `duration` seconds.
+
+        :param easing: maps progress 0..1 to 0..1; gets a NumPy array
+                       (scalar-only functions are applied element-wise)
+        :param start: start value; defaults to the attribute's current value
+        :param delay: seconds to wait before the attribute starts changing
+        :param on_complete: called with the Tween when it reaches `end`
+        """
+        if start is None:
+            start = getattr(target, attr)
+        tw = Tween(target, attr, start, end, duration, delay, easing, on_complete)
+        tw._tweener = self
+
+        i = len(self._tweens)
+        if i == len(self._start):
+            self._grow()
+        try:
+            easing_id = self._easings.index(easing)
+        except ValueError:
+            easing_id = len(self._easings)
+            self._easings.append(easing)
+
+        self._tweens.append(tw)
+        self._start[i] = start
+        self._delta[i] = end - start
+        self._duration[i] = max(duration, 1e-9)
+        self._elapsed[i] = 0.0
+        self._delay[i] = delay
+        self._easing_id[i] = easing_id
+        return tw
+
+    def cancel(self, tween):
+        if tween._tweener is self and not tween.finished:
+            tween.finished = True
+            self._cancelled = True
+
+    def cancel_all(self, target=None):
+        """
+        Cancel every tween, or every tween animating `target`.
+        """
+        for tw in self._tweens:
+            if target is None or tw.target is target:
+                self.cancel(tw)
+
+    def clear(self):
+        for tw in self._tweens:
+            tw.finished = True
+        self._tweens = []
+        self._easings = []
+        self._cancelled = False
+
+    def _grow(self):
+        for name in ("_start", "_delta", "_duration", "_elapsed", "_delay", "_easing_id"):
+            arr = getattr(self, name)
+            grown = np.ones(len(arr) * 2, dtype=arr.dtype) if name == "_duration" else np.zeros(len(arr) * 2, dtype=arr.dtype)
+            grown[:len(arr)] = arr
+            setattr(self, name, grown)
+
+    def _ease(self, t, ids):
+        if len(self._easings) == 1:
+            return _apply_easing(self._easings[0], t)
+        eased = np.empty_like(t)
+        for k, func in enumerate(self._easings):
+            mask = ids == k
+            if mask.any():
+                eased[mask] = _apply_easing(func, t[mask])
+        return eased
+
+    def update(self, dt):
+        """
+        Advance every tween by dt seconds and write the new values.
+        """
+        if self._cancelled:
+            self._compact(np.array([not tw.finished for tw in self._tweens], dtype=bool))
+            self._cancelled = False
+        n = len(self._tweens)
+        if not n:
+            return
+
+        elapsed = self._elapsed[:n]
+        elapsed += dt
+        started = elapsed >= self._delay[:n]
+        t = np.clip((elapsed - self._delay[:n]) / self._duration[:n], 0.0, 1.0)
+        values = self._start[:n] + self._delta[:n] * self._ease(t, self._easing_id[:n])
+        done = t >= 1.0
+
+        tweens = self._tweens
+        if started.all():
+            for tw, value in zip(tweens, values.tolist()):
+                setattr(tw.target, tw.attr, value)
+        else:
+            for i in np.flatnonzero(started).tolist():
+                tw = tweens[i]
+                setattr(tw.target, tw.attr, float(values[i]))
+
+        if done.any():
+            finished = [tweens[i] for i in np.flatnonzero(done).tolist()]
+            for tw in finished:
+                # land exactly on the end value
+                setattr(tw.target, tw.attr, tw.end)
+                tw.finished = True
+            self._compact(~done)
+            for tw in finished:
+                if tw.on_complete is not None:
+                    tw.on_complete(tw)
+
+    def _compact(self, keep):
+        n = len(self._tweens)
+        count = int(np.count_nonzero(keep))
+        if count == n:
+            return
+        for name in ("_start", "_delta", "_duration", "_elapsed", "_delay", "_easing_id"):
+            arr = getattr(self, name)
+            arr[:count] = arr[:n][keep]
+        self._tweens = [tw for tw, k in zip(self._tweens, keep.tolist()) if k]
+        if not self._tweens:
+            self._easings = []
+
+    def __len__(self):
+        return len(self._tweens)
+
+
+def _apply_easing(func, t):
+    """
+    Call an easing function on an array, falling back to element-wise calls
+    for functions that only handle Python scalars.
+    """
+    try:
+        eased = func(t)
+    except (TypeError, ValueError):
+        eased = None
+    if not isinstance(eased, np.ndarray) or eased.shape != t.shape:
+        eased = np.fromiter((func(v) for v in t.tolist()), dtype=float, count=len(t))
+    return eased
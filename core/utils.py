@@ -1,5 +1,11 @@
 import math
 
+import numpy as np
+
+# All interpolation and easing functions accept either Python scalars or
+# NumPy arrays for t (and for a, b in lerp), so whole batches of elements
+# can be animated with one call.
+
 # Linear Interpolation and Basic Easing
 def lerp(a, b, t):
     """Linear interpolation from a to b with parameter t in [0..1]."""
@@ -28,8 +34,41 @@ def cubic_ease_out(t):
 
 def exponential_ease_out(t):
     """Exponential ease-out for a very sharp deceleration (except at t==1)."""
+    if isinstance(t, np.ndarray):
+        return np.where(t == 1, 1.0, 1 - np.power(2.0, -10 * t))
     return 1 if t == 1 else 1 - math.pow(2, -10 * t)
 
+# Easing Lookup Tables
+class EasingTable:
+    """
+    Precomputed lookup table for an easing function, for curves that are
+    expensive to evaluate. Callable like the function it samples.
+
+    Parameters:
+      func:        Easing function mapping [0, 1] -> value.
+      resolution:  Number of samples over [0, 1].
+      interpolate: Linearly interpolate between samples (True) or snap to the
+                   nearest one (False, slightly faster).
+    """
+    def __init__(self, func, resolution=1024, interpolate=True):
+        self.func = func
+        self.resolution = resolution
+        self.interpolate = interpolate
+        self.xs = np.linspace(0.0, 1.0, resolution)
+        self.table = np.asarray(func(self.xs), dtype=float)
+
+    def __call__(self, t):
+        if self.interpolate:
+            eased = np.interp(t, self.xs, self.table)
+        else:
+            index = np.rint(np.clip(t, 0.0, 1.0) * (self.resolution - 1)).astype(np.intp)
+            eased = self.table[index]
+        return eased if isinstance(t, np.ndarray) else float(eased)
+
+def easing_table(func, resolution=1024, interpolate=True):
+    """Return an EasingTable for func (see EasingTable)."""
+    return EasingTable(func, resolution, interpolate)
+
 # Color Utilities
 def rgb_to_hex(r, g, b):
     """
@@ -67,12 +106,62 @@ def mix_colors(color1, color2, t):
       color1: A tuple (r, g, b) for the first color.
       color2: A tuple (r, g, b) for the second color.
       t:      A float in [0, 1] indicating the mixing ratio. 0 returns color1; 1 returns color2.
+              May be a NumPy array of ratios to mix many colors at once.
 
     Returns:
-      A tuple (r, g, b) for the mixed color.
+      A tuple (r, g, b) for the mixed color, or a uint8 array of shape
+      (len(t), channels) when t is an array.
     """
+    if isinstance(t, np.ndarray):
+        c1 = np.asarray(color1, dtype=float)
+        c2 = np.asarray(color2, dtype=float)
+        return lerp(c1, c2, t[..., None]).astype(np.uint8)
     return tuple(int(lerp(c1, c2, t)) for c1, c2 in zip(color1, color2))
 
+def gradient(colors, steps, easing=None):
+    """
+    Build a whole color ramp at once.
+
+    Parameters:
+      colors: Sequence of two or more (r, g, b) color stops, evenly spaced.
+      steps:  Number of colors in the ramp.
+      easing: Optional easing function applied to the ramp position.
+
+    Returns:
+      A uint8 array of shape (steps, channels); ramp[0] is colors[0] and
+      ramp[-1] is colors[-1].
+    """
+    stops = np.asarray(colors, dtype=float)
+    t = np.linspace(0.0, 1.0, steps)
+    if easing is not None:
+        t = np.clip(np.asarray(easing(t), dtype=float), 0.0, 1.0)
+    pos = t * (len(stops) - 1)
+    index = np.minimum(pos.astype(np.intp), len(stops) - 2)
+    local = (pos - index)[:, None]
+    return np.rint(lerp(stops[index], stops[index + 1], local)).astype(np.uint8)
+
+# Array Utilities
+def compact_arrays(arrays, alive):
+    """
+    Move the rows of a structure-of-arrays pool that are still alive to the
+    front of every array, keeping their order (freed slots end up at the
+    back, ready for reuse).
+
+    Parameters:
+      arrays: Arrays sharing the same leading axis; only the first
+              len(alive) rows are looked at.
+      alive:  Boolean mask over those rows.
+
+    Returns:
+      The number of rows kept.
+    """
+    n = len(alive)
+    count = int(np.count_nonzero(alive))
+    if count != n:
+        for arr in arrays:
+            arr[:count] = arr[:n][alive]
+    return count
+
 # Example predefined color constants
 COLOR_PRIMARY   = (50, 150, 250)  # A sample blue
 COLOR_SECONDARY = (250, 150, 50)  # A sample orange
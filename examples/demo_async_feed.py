@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+demo_async_feed.py
+
+Gauges and a log driven by a networked data feed, with the Engine running
+inside asyncio (Engine.run_async()) instead of a thread per feed.
+ - a local asyncio TCP server stands in for the real feed: it streams
+   "name value" lines for a few metrics
+ - the Scene spawns a client coroutine that reads the stream. Readings go
+   into Observables bound to the gauges and DataBlocks, so however fast they
+   arrive each widget updates at most once per frame; log lines are handed
+   over with engine.call_soon(), held to the engine's async budget per frame
+ - a "log compactor" coroutine does CPU work in small chunks, awaiting
+   engine.throttle() between them so it only runs between frames
+
+Pass --offscreen to run the 10 second scene headless, as fast as it
+goes, and print the task stats.
+"""
+import asyncio
+import math
+import random
+import sys
+
+from core.engine import Engine
+from core.scene import Scene
+from core.hud.circular import CircularProgress
+from core.hud.console import Console
+from core.binding import Observable
+from core.hud.text import DataBlock
+
+METRICS = ["cpu", "mem", "net", "disk"]
+
+async def serve_metrics(reader, writer, rate=200):
+    """
+    Stand-in feed: `rate` readings per second of slowly drifting metrics.
+    """
+    t = 0.0
+    try:
+        while True:
+            t += 1.0 / rate
+            name = random.choice(METRICS)
+            phase = METRICS.index(name)
+            value = 0.5 + 0.4 * math.sin(t * (0.5 + phase * 0.3) + phase) + random.uniform(-0.05, 0.05)
+            writer.write(b"%s %.4f\n" % (name.encode(), value))
+            await writer.drain()
+            await asyncio.sleep(1.0 / rate)
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+
+class FeedScene(Scene):
+    def __init__(self, port, **kwargs):
+        self.port = port
+        self.metrics = {name: Observable(name=name) for name in METRICS}
+        effects = []
+        for i, name in enumerate(METRICS):
+            x = 150 + i * 250
+            metric = self.metrics[name]
+            gauge = CircularProgress(x, 180, radius=80, color=(0,200,200), glow=6)
+            metric.bind(gauge, transform=lambda v: v or 0.0)
+            label = DataBlock(name.upper(), x - 70, 280, fmt="{:.1%}", width=140, font_size=22, source=metric)
+            effects += [gauge, label]
+        self.log = Console(50, 340, 900, 330, capacity=2000, font_size=16, prompt=None)
+        effects.append(self.log)
+        super().__init__(effects=effects, **kwargs)
+
+    def reset(self, engine):
+        super().reset(engine)
+        self.spawn(self.read_feed())
+        self.spawn(self.compact_log())
+
+    async def read_feed(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                name, value = line.decode().split()
+                self.metrics[name].set(float(value))
+                self.engine.call_soon(self.log.write, "%-5s %s" % (name, value))
+        finally:
+            writer.close()
+
+    async def compact_log(self):
+        # busywork standing in for parsing/aggregating: small chunks,
+        # each followed by a throttle() so frames are never delayed by it
+        total = 0
+        while True:
+            total += sum(i * i for i in range(2000))
+            await self.engine.throttle()
+
+
+async def main():
+    offscreen = "--offscreen" in sys.argv
+    server = await asyncio.start_server(serve_metrics, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    engine = Engine(width=1000, height=700, title="CybrHUD Async Feed Demo", offscreen=offscreen)
+    engine.add_scene(FeedScene(port, duration=10.0 if offscreen else 0))
+    async with server:
+        await engine.run_async()
+    if offscreen:
+        print(engine.frame_count, "frames", engine.tasks.stats())
+
+if __name__ == "__main__":
+    asyncio.run(main())
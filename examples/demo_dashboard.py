@@ -32,15 +32,17 @@ def main():
 
     # Effects
     background_grid = HexGrid(color=(40,40,70), cell_size=50)
+    background_grid.layer = "background"  # rendered once, then a single blit
     panel = SlidingPanel(100, 100, 400, 300, direction='left')
     radar = RadarSweep(x=900, y=300, radius=150)
-    meter = CircularProgress(x=300, y=250, radius=80, value=0.25, color=(0,200,200))
+    meter = CircularProgress(x=300, y=250, radius=80, value=0.25, color=(0,200,200), glow=8)
     meter.speed = 0.1  # animate up slowly
     text1 = TextBlock("SYSTEM STATUS", 130, 110, font_size=28, color=(255,255,255))
     emitter = ParticleEmitter(x=640, y=360, color=(0,255,255))
 
     # Put them in a scene
-    scene = Scene(effects=[background_grid, emitter, panel, radar, meter, text1], duration=10.0)
+    scene = Scene(effects=[background_grid, emitter, panel, radar, meter, text1], duration=10.0,
+                  layers=["background", None])
     engine.add_scene(scene)
 
     engine.run()
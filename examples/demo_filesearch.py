@@ -22,6 +22,7 @@ import random
 from core.engine import Engine
 from core.scene import Scene
 from core.effect import Effect
+from core.fonts import get_font, render_text
 
 SEARCH_DURATION = 300.0  # 5 minutes
 
@@ -65,6 +66,7 @@ class FilePage(Effect):
         self.scale = 1.0
         self.drift_dir = random.choice([-1,1])
         self._font = None
+        self._highlight_cache = {}
 
     def reset(self):
         # Called each time scene starts
@@ -108,7 +110,7 @@ class FilePage(Effect):
 
     def draw(self, screen):
         if self._font is None:
-            self._font = pygame.font.SysFont("Arial", 18)
+            self._font = get_font("Arial", 18)
 
         surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
         # color page
@@ -143,6 +145,13 @@ class FilePage(Effect):
         screen.blit(surf, rect)
 
     def _render_highlight(self, text):
+        # the page text never changes, so each line is composed once
+        line = self._highlight_cache.get(text)
+        if line is None:
+            line = self._highlight_cache[text] = self._compose_highlight(text)
+        return line
+
+    def _compose_highlight(self, text):
         # highlight synonyms in green
         container = pygame.Surface((self.width, 25), pygame.SRCALPHA)
         words = text.split()
@@ -151,7 +160,7 @@ class FilePage(Effect):
             color = (0,0,0)
             if w.lower() in self.synonyms:
                 color = (0,180,0)
-            label = self._font.render(w+" ", True, color)
+            label = render_text(self._font, w+" ", color)
             container.blit(label, (x_off, 0))
             x_off += label.get_width()
         return container
@@ -0,0 +1,23 @@
+"""
+Regression checks for the Engine, run headless (offscreen).
+"""
+import gc
+
+from core.effect import Effect
+from core.engine import Engine
+from core.scene import Scene
+
+
+def test_gc_freeze_alone_keeps_automatic_collection():
+    seen = []
+
+    class Probe(Effect):
+        def update(self, dt):
+            super().update(dt)
+            seen.append((gc.isenabled(), gc.get_freeze_count() > 0))
+
+    engine = Engine(800, 600, offscreen=True, gc_freeze=True)
+    engine.add_scene(Scene(effects=[Probe()], duration=0.05))
+    engine.run()
+    assert seen and all(enabled and frozen for enabled, frozen in seen)
+    assert gc.isenabled()
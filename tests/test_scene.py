@@ -0,0 +1,70 @@
+"""
+Regression checks for Scene bookkeeping, run headless with an offscreen Engine.
+"""
+import pygame
+
+from core.effect import Effect
+from core.engine import Engine
+from core.scene import Scene
+from core.hud.panel import SlidingPanel
+
+
+def test_spatial_index_follows_tweened_static_panel():
+    # the panel is static and moved by its tweens without mark_dirty(): the
+    # index, built by the first query while it is off-screen, must follow it
+    engine = Engine(800, 600, offscreen=True)
+    panel = SlidingPanel(100, 100, 200, 100, direction='left')
+    scene = Scene(effects=[panel])
+    engine.add_scene(scene)
+    engine.step()
+    assert scene.effects_at((150, 150)) == []
+    engine.step(120)
+    assert scene.effects_at((150, 150)) == [panel]
+    assert scene.spatial.rect_of(panel) == (100, 100, 200, 100)
+
+
+class _Recorder(Effect):
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def handle_event(self, event):
+        self.events.append(event.type)
+
+
+def test_events_go_to_replaced_effects():
+    engine = Engine(800, 600, offscreen=True)
+    a, b, c, d = (_Recorder() for _ in range(4))
+    scene = Scene(effects=[a, b])
+    scene.reset(engine)
+    scene.update(1 / 60)
+    scene.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a))
+    scene.effects = [c, d]
+    scene.reset(engine)
+    scene.update(1 / 60)
+    scene.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a))
+    assert a.events == b.events == [pygame.KEYDOWN]
+    assert c.events == d.events == [pygame.KEYDOWN]
+
+
+def test_add_effect_before_start_with_offscreen_engine():
+    engine = Engine(800, 600, offscreen=True)
+    scene = Scene()
+    panel = SlidingPanel(100, 100, 200, 100, direction='up')
+    scene.add_effect(panel)  # no Engine yet, and no display surface
+    engine.add_scene(scene)
+    engine.step()
+    assert 100 < panel.y <= 600  # sliding up from the bottom of the offscreen surface
+
+
+def test_find_effects_in_insertion_order():
+    class A(Effect):
+        pass
+
+    class B(A):
+        pass
+
+    a, b, u, k = A(), B(), A(), B()
+    scene = Scene(effects=[a, b, u, k])
+    assert scene.find_effects(A) == [a, b, u, k]
+    assert scene.find_effects(B) == [b, k]